@@ -2,10 +2,24 @@
 Data processing handlers for SAP Price Updater.
 All data transformation logic is separated here for testability.
 """
+import csv
+import functools
+import hashlib
+import io
+import os
+import re
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
-import re
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple, List, Union
+
+# Copy-on-Write: shallow copies share column data until a column is
+# reassigned, so the caller's frames are never modified. Always on (and the
+# option deprecated) since pandas 3.0, opt-in before that.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
 
 
 def normalize_article_code(value) -> str:
@@ -23,6 +37,16 @@ def normalize_article_code(value) -> str:
     # Handle None and NaN
     if value is None:
         return ""
+    
+    # Fast paths for the common shapes: Python ints and clean digit strings
+    # (without leading zeros and short enough to survive the float round-trip)
+    if type(value) is int:
+        return str(value)
+    if type(value) is str:
+        str_value = value.strip()
+        if str_value.isdigit() and str_value.isascii() and str_value[0] != '0' and len(str_value) <= 15:
+            return str_value
+    
     if isinstance(value, float) and np.isnan(value):
         return ""
     if pd.isna(value):
@@ -64,7 +88,10 @@ def normalize_article_code(value) -> str:
 
 def normalize_code_column(series: pd.Series) -> pd.Series:
     """
-    Apply normalize_article_code to an entire pandas Series.
+    Normalize an entire pandas Series of article codes.
+    Vectorized equivalent of applying normalize_article_code to every element:
+    parsing and formatting run in pandas/NumPy kernels instead of one Python
+    call per row.
     
     Args:
         series: A pandas Series containing article codes
@@ -72,38 +99,409 @@ def normalize_code_column(series: pd.Series) -> pd.Series:
     Returns:
         A new Series with all codes normalized to strings
     """
-    return series.apply(normalize_article_code)
+    # Columns with many repeated codes (e.g. SAP lists) are normalized once
+    # per distinct value and expanded back with the factorized codes
+    if series.dtype == object and _mostly_repeated(series):
+        codes, uniques = pd.factorize(series, use_na_sentinel=False)
+        uniques = pd.Series(uniques, dtype=object)
+        # factorize takes 1, 1.0 and True (or 0, 0.0 and False) as one key,
+        # but bools normalize to 'True'/'False': normalize per row instead
+        if not uniques.isin([0, 1]).any():
+            result = normalize_code_column(uniques).take(codes)
+            result.index = series.index
+            result.name = series.name
+            return result
+    
+    missing = series.isna().to_numpy()
+    
+    # Integer columns only need a string cast (no parsing involved)
+    if pd.api.types.is_integer_dtype(series.dtype):
+        result = series.astype(str).to_numpy(dtype=object)
+        result[missing] = ""
+        return pd.Series(result, index=series.index, name=series.name, dtype=str)
+    
+    if pd.api.types.is_float_dtype(series.dtype):
+        text = None
+        blank = missing
+        numeric = series.to_numpy(dtype='float64', na_value=np.nan)
+    else:
+        stripped = series.astype(str).str.strip()
+        blank = missing | stripped.str.lower().isin(('', 'nan', 'none')).to_numpy()
+        text = stripped.to_numpy(dtype=object)
+        numeric = _parse_numeric_strings(np.where(blank, 'nan', text))
+    
+    finite = np.isfinite(numeric)
+    whole = finite & (np.floor(numeric) == numeric)
+    fits_int64 = whole & (np.abs(numeric) < 2.0 ** 63)
+    
+    result = np.empty(len(series), dtype=object)
+    # Non-numeric values are kept as their stripped string
+    if text is not None:
+        result[~finite] = text[~finite]
+    else:
+        result[~finite] = [str(value) for value in numeric[~finite]]
+    # Floats with a meaningful decimal part keep it ("123.5")
+    decimal = finite & ~whole
+    result[decimal] = numeric[decimal].astype(str)
+    # Whole numbers lose the decimal ("123.0" -> "123", "1.23E+05" -> "123000")
+    result[fits_int64] = numeric[fits_int64].astype(np.int64).astype(str)
+    huge = whole & ~fits_int64
+    result[huge] = [str(int(value)) for value in numeric[huge]]
+    
+    # Python ints are formatted exactly, as by normalize_article_code: only
+    # those beyond float64's exact range (2**53) can differ from the float
+    if text is not None:
+        beyond_float = np.flatnonzero(whole & (np.abs(numeric) >= 2.0 ** 53))
+        if beyond_float.size:
+            values = series.to_numpy(dtype=object)
+            for position in beyond_float:
+                if type(values[position]) is int:
+                    result[position] = str(values[position])
+    
+    # Handle empty and nan/none-like values
+    result[blank] = ""
+    
+    # dtype=str is pandas' string dtype, stored as a packed Arrow string
+    # array when pyarrow is installed (instead of one PyObject per code)
+    return pd.Series(result, index=series.index, name=series.name, dtype=str)
+
+
+# Sample size used to estimate how repeated the codes of a column are
+_REPEAT_SAMPLE_SIZE = 10000
+
+
+def _mostly_repeated(series: pd.Series) -> bool:
+    """
+    Estimate from an evenly spaced sample whether most values of a Series
+    are repeats (fewer than half of them distinct).
+    
+    Args:
+        series: A pandas Series
+    
+    Returns:
+        True if normalizing only the distinct values is likely to pay off
+    """
+    if len(series) < 2 * _REPEAT_SAMPLE_SIZE:
+        return False
+    step = len(series) // _REPEAT_SAMPLE_SIZE
+    sample = series.iloc[::step]
+    return sample.nunique(dropna=False) < len(sample) // 2
+
+
+def _parse_numeric_strings(text: np.ndarray) -> np.ndarray:
+    """
+    Parse an object array of stripped strings to float64, NaN where not numeric.
+    
+    Args:
+        text: Object array of stripped strings
+    
+    Returns:
+        float64 array with the parsed values (NaN for non-numeric strings)
+    """
+    try:
+        # Fast path: every value is numeric
+        return text.astype('float64')
+    except ValueError:
+        pass
+    
+    # pd.to_numeric finds the numeric entries, but it can round differently
+    # than float() in the last digit, so the values are re-parsed exactly
+    is_number = pd.to_numeric(pd.Series(text), errors='coerce').notna().to_numpy()
+    numeric = np.full(len(text), np.nan)
+    try:
+        numeric[is_number] = text[is_number].astype('float64')
+    except ValueError:
+        numeric[is_number] = [_to_float(value) for value in text[is_number]]
+    
+    # float() also accepts forms to_numeric rejects ('1_000', non-ASCII
+    # digits): parse the rejected entries with it too, so a value does not
+    # depend on the other rows of the column (blanks are passed as 'nan')
+    rejected = np.flatnonzero(~is_number & (text != 'nan'))
+    if rejected.size:
+        numeric[rejected] = [_to_float(value) for value in text[rejected]]
+    return numeric
+
+
+def _to_float(value: str) -> float:
+    """Convert a string to float, returning NaN if it is not a number."""
+    try:
+        return float(value)
+    except ValueError:
+        return np.nan
+
+
+# Rust-based reader (python-calamine), much faster and lighter than openpyxl
+DEFAULT_EXCEL_ENGINE = 'calamine'
+
+# Engine for reading only the first rows (headers, previews): pandas' default
+# for the file type. calamine always loads the whole sheet, even for nrows=0,
+# while openpyxl streams .xlsx files and stops after the rows requested.
+PROBE_EXCEL_ENGINE = None
+
+
+def _read_excel(file_path: str, engine: Optional[str] = DEFAULT_EXCEL_ENGINE, **kwargs) -> pd.DataFrame:
+    """
+    Read an Excel file with the given engine.
+    Falls back to pandas' default engine for the file type (openpyxl for
+    .xlsx, xlrd for .xls) when the engine's package is not installed.
+    
+    Args:
+        file_path: Path to the Excel file
+        engine: pandas read_excel engine (None for pandas' default)
+        **kwargs: Other arguments passed to pd.read_excel
+    
+    Returns:
+        DataFrame with the sheet data
+    """
+    try:
+        return pd.read_excel(file_path, engine=engine, **kwargs)
+    except ImportError:
+        if engine is None:
+            raise
+        return pd.read_excel(file_path, **kwargs)
 
 
-def get_excel_columns(file_path: str, sheet_name: str = None) -> List[str]:
+def get_excel_columns(file_path: str, sheet_name: str = None,
+                      engine: Optional[str] = PROBE_EXCEL_ENGINE,
+                      fallback_to_first_sheet: bool = False) -> List[str]:
     """
     Get the column names from an Excel file without loading all data.
+    Results are cached by file modification time, so probing an unchanged
+    file again does not re-open the workbook.
     
     Args:
         file_path: Path to the Excel file
         sheet_name: Name of the sheet (optional, uses first sheet if not specified)
+        engine: pandas read_excel engine
+        fallback_to_first_sheet: Use the first sheet when the workbook has
+            no sheet named sheet_name (checked on the same open workbook)
     
     Returns:
         List of column names
+    
+    Raises:
+        ValueError: If the sheet is not found (and there is no fallback)
     """
-    if sheet_name:
-        df = pd.read_excel(file_path, sheet_name=sheet_name, nrows=0)
-    else:
-        df = pd.read_excel(file_path, nrows=0)
-    return list(df.columns)
+    mtime = os.path.getmtime(file_path)
+    return list(_read_excel_columns(file_path, mtime, sheet_name, engine, fallback_to_first_sheet))
+
+
+@functools.lru_cache(maxsize=32)
+def _read_excel_columns(file_path: str, mtime: float, sheet_name: Optional[str],
+                        engine: Optional[str], fallback_to_first_sheet: bool = False) -> Tuple:
+    """Read the header row of a sheet (cached, see get_excel_columns)."""
+    try:
+        excel_file = pd.ExcelFile(file_path, engine=engine)
+    except ImportError:
+        if engine is None:
+            raise
+        excel_file = pd.ExcelFile(file_path)
+    
+    with excel_file:
+        sheet = sheet_name or 0
+        if sheet_name and fallback_to_first_sheet and sheet_name not in excel_file.sheet_names:
+            sheet = 0
+        df = excel_file.parse(sheet, nrows=0)
+    return tuple(df.columns)
+
+
+def get_excel_preview(file_path: str, sheet_name: str = None, nrows: int = 1000,
+                      engine: Optional[str] = PROBE_EXCEL_ENGINE) -> pd.DataFrame:
+    """
+    Get the first rows of an Excel sheet, for previews.
+    Cached by file modification time like get_excel_columns.
+    
+    Args:
+        file_path: Path to the Excel file
+        sheet_name: Name of the sheet (optional, uses first sheet if not specified)
+        nrows: Number of data rows to read
+        engine: pandas read_excel engine
+    
+    Returns:
+        DataFrame with up to nrows rows (a copy, safe to modify)
+    """
+    mtime = os.path.getmtime(file_path)
+    return _read_excel_preview(file_path, mtime, sheet_name, nrows, engine).copy()
+
+
+@functools.lru_cache(maxsize=8)
+def _read_excel_preview(file_path: str, mtime: float, sheet_name: Optional[str],
+                        nrows: int, engine: Optional[str]) -> pd.DataFrame:
+    """Read the first rows of a sheet (cached, see get_excel_preview)."""
+    return _read_excel(file_path, engine, sheet_name=sheet_name or 0, nrows=nrows)
+
+
+def _user_cache_dir() -> str:
+    """Get the per-user directory for the Parquet caches."""
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+        return os.path.join(base, 'SapPriceUpdater', 'cache')
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'sap_price_updater')
+
+
+# Directory for the Parquet copies of loaded Excel files (see _read_cache).
+# They hold cost data, so the directory is private to the user (0o700).
+CACHE_DIR = _user_cache_dir()
+
+# Version of the cached frames: bump it whenever the loaders or the code
+# normalization produce different output, so older caches are not served
+CACHE_VERSION = 4
+
+# Cache files kept at most, and their maximum age; older ones are pruned
+CACHE_MAX_FILES = 32
+CACHE_MAX_AGE_DAYS = 30
+
+
+def _cache_dir_is_private(create: bool = False) -> bool:
+    """
+    Check CACHE_DIR can be trusted: a directory owned by the current user
+    that other users cannot read or write (checked on POSIX only, the
+    Windows per-user profile directory is already private).
+    
+    Args:
+        create: Create the directory (mode 0o700) if it does not exist
+    
+    Returns:
+        True if the cache can be read and written
+    """
+    try:
+        if create:
+            os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+        info = os.lstat(CACHE_DIR)
+    except OSError:
+        return False
+    
+    if not stat.S_ISDIR(info.st_mode):
+        return False
+    if hasattr(os, 'getuid'):
+        return info.st_uid == os.getuid() and not info.st_mode & 0o077
+    return True
+
+
+def _prune_cache() -> None:
+    """Delete cache files beyond CACHE_MAX_FILES (oldest first) or older than CACHE_MAX_AGE_DAYS."""
+    try:
+        entries = []
+        for entry in os.scandir(CACHE_DIR):
+            if entry.name.endswith('.parquet') and entry.is_file(follow_symlinks=False):
+                entries.append((entry.stat(follow_symlinks=False).st_mtime, entry.path))
+    except OSError:
+        return
+    
+    entries.sort(reverse=True)
+    oldest_kept = time.time() - CACHE_MAX_AGE_DAYS * 86400
+    for position, (mtime, path) in enumerate(entries):
+        if position >= CACHE_MAX_FILES or mtime < oldest_kept:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _cache_path(file_path: str, *key) -> str:
+    """Get the cache file for an Excel file and the load options in key."""
+    digest = hashlib.sha1(repr((os.path.abspath(file_path),) + key).encode('utf-8')).hexdigest()
+    return os.path.join(CACHE_DIR, digest + '.parquet')
+
+
+def _source_stamp(file_path: str) -> str:
+    """Get the stamp _read_cache checks: cache version, mtime and size of the source file."""
+    info = os.stat(file_path)
+    return f"{CACHE_VERSION}:{info.st_mtime!r}:{info.st_size}"
+
+
+def _read_cache(cache_path: str, stamp: str) -> Optional[pd.DataFrame]:
+    """
+    Read a DataFrame saved by _write_cache, if it is still valid.
+    
+    Args:
+        cache_path: Path to the cache file
+        stamp: Current _source_stamp() of the source Excel file
+    
+    Returns:
+        The cached DataFrame, or None if there is no valid cache (missing,
+        stale, unreadable, or pyarrow not installed)
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+    
+    if not _cache_dir_is_private():
+        return None
+    
+    try:
+        # The schema is read first, the data only if the cache is up to date
+        metadata = pq.read_schema(cache_path).metadata or {}
+        if metadata.get(b'source_stamp') != stamp.encode():
+            return None
+        df = pq.read_table(cache_path).to_pandas()
+        # Mark it as recently used, so pruning drops unused caches first
+        os.utime(cache_path)
+        return df
+    except (OSError, pa.ArrowException):
+        return None
+
+
+def _write_cache(cache_path: str, df: pd.DataFrame, stamp: str) -> None:
+    """
+    Save a loaded DataFrame as Parquet (zstd), tagged with the source stamp.
+    Caching is best-effort: errors (DataFrames that Arrow cannot store,
+    such as mixed-type columns, or a non-writable directory) are ignored,
+    and nothing is written to a CACHE_DIR that is not private.
+    
+    Args:
+        cache_path: Path to the cache file
+        df: DataFrame to save
+        stamp: _source_stamp() of the source Excel file
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        return
+    
+    try:
+        table = pa.Table.from_pandas(df)
+        metadata = dict(table.schema.metadata or {})
+        metadata[b'source_stamp'] = stamp.encode()
+        table = table.replace_schema_metadata(metadata)
+        
+        # Write to a temporary file first so readers never see a partial file
+        if not _cache_dir_is_private(create=True):
+            return
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        pq.write_table(table, temp_path, compression='zstd')
+        os.replace(temp_path, cache_path)
+    except (OSError, pa.ArrowException):
+        return
+    
+    _prune_cache()
 
 
 def load_cost_file(file_path: str, article_column: str = 'Artículo', 
                    value_column: str = 'Manufactura FC', 
-                   sheet_name: str = 'COSTO PROD') -> Tuple[pd.DataFrame, str, str]:
+                   sheet_name: str = 'COSTO PROD',
+                   engine: Optional[str] = DEFAULT_EXCEL_ENGINE,
+                   use_cache: bool = True,
+                   cache_categorical: bool = False) -> Tuple[pd.DataFrame, str, str]:
     """
     Load the cost file and prepare it for processing.
+    Only the article and value columns are read from the sheet.
+    The result is cached as Parquet in CACHE_DIR, so loading an unchanged
+    file again skips the Excel parsing.
     
     Args:
         file_path: Path to the Excel file
         article_column: Name of the column containing article codes
         value_column: Name of the column containing the value to extract
         sheet_name: Name of the sheet to load
+        engine: pandas read_excel engine
+        use_cache: Whether to use (and update) the Parquet cache
+        cache_categorical: Return the article column as a categorical, for
+            workflows that merge the same data repeatedly (see merge_data)
     
     Returns:
         Tuple of (DataFrame with normalized article column, article_column name, value_column name)
@@ -112,27 +510,48 @@ def load_cost_file(file_path: str, article_column: str = 'Artículo',
         ValueError: If required columns are missing
         FileNotFoundError: If file doesn't exist
     """
-    df = pd.read_excel(file_path, sheet_name=sheet_name)
-    
-    # Validate required columns
-    if article_column not in df.columns:
-        raise ValueError(f"Column '{article_column}' not found in cost file.")
-    if value_column not in df.columns:
-        raise ValueError(f"Column '{value_column}' not found in cost file.")
+    stamp = _source_stamp(file_path)
+    cache_path = _cache_path(file_path, 'cost', sheet_name, article_column, value_column)
+    df = _read_cache(cache_path, stamp) if use_cache else None
+    
+    if df is None:
+        needed_columns = (article_column, value_column)
+        df = _read_excel(file_path, engine, sheet_name=sheet_name,
+                         usecols=lambda column: column in needed_columns)
+        
+        # Validate required columns
+        if article_column not in df.columns:
+            raise ValueError(f"Column '{article_column}' not found in cost file.")
+        if value_column not in df.columns:
+            raise ValueError(f"Column '{value_column}' not found in cost file.")
+        
+        # Normalize the article code column
+        df[article_column] = normalize_code_column(df[article_column])
+        
+        if use_cache:
+            _write_cache(cache_path, df, stamp)
     
-    # Normalize the article code column
-    df[article_column] = normalize_code_column(df[article_column])
+    if cache_categorical:
+        df[article_column] = df[article_column].astype('category')
     
     return df, article_column, value_column
 
 
-def load_sap_file(file_path: str, article_column: str = 'Número de artículo') -> Tuple[pd.DataFrame, str]:
+def load_sap_file(file_path: str, article_column: str = 'Número de artículo',
+                  engine: Optional[str] = DEFAULT_EXCEL_ENGINE,
+                  use_cache: bool = True,
+                  cache_categorical: bool = False) -> Tuple[pd.DataFrame, str]:
     """
     Load the SAP file and prepare it for processing.
+    Only the article column is read from the sheet.
+    Cached as Parquet like load_cost_file.
     
     Args:
         file_path: Path to the Excel file
         article_column: Name of the column containing article codes
+        engine: pandas read_excel engine
+        use_cache: Whether to use (and update) the Parquet cache
+        cache_categorical: Return the article column as a categorical
     
     Returns:
         Tuple of (DataFrame with normalized article column, article_column name)
@@ -141,18 +560,53 @@ def load_sap_file(file_path: str, article_column: str = 'Número de artículo')
         ValueError: If required columns are missing
         FileNotFoundError: If file doesn't exist
     """
-    df = pd.read_excel(file_path)
+    stamp = _source_stamp(file_path)
+    cache_path = _cache_path(file_path, 'sap', article_column)
+    df = _read_cache(cache_path, stamp) if use_cache else None
     
-    # Validate required columns
-    if article_column not in df.columns:
-        raise ValueError(f"Column '{article_column}' not found in SAP file.")
+    if df is None:
+        df = _read_excel(file_path, engine, usecols=lambda column: column == article_column)
+        
+        # Validate required columns
+        if article_column not in df.columns:
+            raise ValueError(f"Column '{article_column}' not found in SAP file.")
+        
+        # Normalize the article code column
+        df[article_column] = normalize_code_column(df[article_column])
+        
+        if use_cache:
+            _write_cache(cache_path, df, stamp)
     
-    # Normalize the article code column
-    df[article_column] = normalize_code_column(df[article_column])
+    if cache_categorical:
+        df[article_column] = df[article_column].astype('category')
     
     return df, article_column
 
 
+def find_column(columns, patterns: List[re.Pattern]) -> Optional[str]:
+    """
+    Find the column that best matches a list of patterns.
+    Patterns are tried in priority order: the first column matching the
+    first pattern wins, then the first column matching the second, etc.
+    
+    Args:
+        columns: Column names (non-string names are matched as strings)
+        patterns: Compiled regular expressions, highest priority first
+    
+    Returns:
+        The matching column name, or None if no column matches
+    """
+    for pattern in patterns:
+        for column in columns:
+            if pattern.search(str(column)):
+                return column
+    return None
+
+
+# Pastes with fewer lines than this are split in Python instead of read_csv
+_SMALL_PASTE_LINES = 2000
+
+
 def parse_clipboard_data(clipboard_text: str) -> pd.DataFrame:
     """
     Parse tab-separated data from clipboard into a DataFrame.
@@ -170,32 +624,23 @@ def parse_clipboard_data(clipboard_text: str) -> pd.DataFrame:
     if not clipboard_text or not clipboard_text.strip():
         raise ValueError("No hay datos en el portapapeles.")
     
-    # Split into lines
-    lines = clipboard_text.strip().split('\n')
+    text = clipboard_text.strip()
+    header_line, newline, _ = text.partition('\n')
     
-    if len(lines) < 2:
+    if not newline:
         raise ValueError("Los datos deben tener al menos una fila de encabezados y una fila de datos.")
     
-    # Parse header (first line)
-    headers = lines[0].split('\t')
-    headers = [h.strip() for h in headers]
-    
-    # Parse data rows
-    data_rows = []
-    for line in lines[1:]:
-        if line.strip():  # Skip empty lines
-            row = line.split('\t')
-            # Pad row if it has fewer columns than headers
-            while len(row) < len(headers):
-                row.append('')
-            # Truncate if it has more columns
-            row = row[:len(headers)]
-            data_rows.append(row)
-    
-    if not data_rows:
-        raise ValueError("No se encontraron filas de datos.")
+    headers = [h.strip() for h in header_line.split('\t')]
     
-    df = pd.DataFrame(data_rows, columns=headers)
+    if text.count('\n') < _SMALL_PASTE_LINES:
+        # Few lines (e.g. typing in the paste preview): splitting them in
+        # Python is faster than setting up the C parser
+        df = _split_clipboard_lines(text, headers)
+    else:
+        df = _read_clipboard_lines(text, headers)
+    
+    if df.empty:
+        raise ValueError("No se encontraron filas de datos.")
     
     # Remove last row if it's all empty or zeros (common clipboard artifact)
     df = _remove_empty_trailing_rows(df)
@@ -203,6 +648,147 @@ def parse_clipboard_data(clipboard_text: str) -> pd.DataFrame:
     return df
 
 
+def _split_clipboard_lines(text: str, headers: List[str]) -> pd.DataFrame:
+    """
+    Split tab-separated lines into a DataFrame of strings (see _read_clipboard_lines).
+    
+    Args:
+        text: Stripped clipboard text, header line included
+        headers: Column names, from the header line
+    
+    Returns:
+        DataFrame with the non-blank data rows, with a fresh index
+    """
+    width = len(headers)
+    padding = [''] * width
+    rows = [
+        (line.split('\t') + padding)[:width]
+        for line in text.split('\n')[1:]
+        if line.strip()
+    ]
+    return pd.DataFrame(rows, columns=headers, dtype=str)
+
+
+def _read_clipboard_lines(text: str, headers: List[str]) -> pd.DataFrame:
+    """
+    Parse tab-separated lines into a DataFrame of strings with the C parser.
+    Short rows are padded with empty strings, extra fields are dropped and
+    whitespace-only lines are skipped.
+    
+    Args:
+        text: Stripped clipboard text, header line included
+        headers: Column names, from the header line
+    
+    Returns:
+        DataFrame with the non-blank data rows, with a fresh index
+    """
+    # Parse everything (header line included, so it fixes the column count)
+    # with the C parser, one row per '\n'-separated line. Short rows are
+    # padded with empty strings and extra fields are truncated to the
+    # header count.
+    df = pd.read_csv(
+        io.StringIO(text),
+        sep='\t',
+        lineterminator='\n',
+        header=None,
+        usecols=range(len(headers)),
+        dtype=str,
+        na_filter=False,
+        quoting=csv.QUOTE_NONE,
+        skip_blank_lines=False,
+        engine='c'
+    )
+    df.columns = headers
+    
+    # Skip empty lines
+    return _drop_blank_lines(df, text)
+
+
+def parse_clipboard_single_column(clipboard_text: str, column: str) -> pd.DataFrame:
+    """
+    Parse only one column of tab-separated clipboard data.
+    For callers that already know the column they need (e.g. the SAP article
+    column): the other fields are skipped by the CSV parser instead of being
+    turned into string columns. Blank lines are dropped as in
+    parse_clipboard_data; trailing empty rows are kept, since they carry no
+    article code and prepare_sap_from_clipboard removes them.
+    
+    Args:
+        clipboard_text: Raw text from clipboard (tab-separated values)
+        column: Header of the column to extract
+    
+    Returns:
+        DataFrame with the single column
+    
+    Raises:
+        ValueError: If data cannot be parsed, is empty or lacks the column
+    """
+    if not clipboard_text or not clipboard_text.strip():
+        raise ValueError("No hay datos en el portapapeles.")
+    
+    text = clipboard_text.strip()
+    header_line, newline, _ = text.partition('\n')
+    
+    if not newline:
+        raise ValueError("Los datos deben tener al menos una fila de encabezados y una fila de datos.")
+    
+    headers = [h.strip() for h in header_line.split('\t')]
+    if column not in headers:
+        raise ValueError(f"Column '{column}' not found in pasted data.")
+    
+    df = pd.read_csv(
+        io.StringIO(text),
+        sep='\t',
+        lineterminator='\n',
+        header=None,
+        usecols=[headers.index(column)],
+        dtype=str,
+        na_filter=False,
+        quoting=csv.QUOTE_NONE,
+        skip_blank_lines=False,
+        engine='c'
+    )
+    df.columns = [column]
+    
+    # Skip empty lines
+    df = _drop_blank_lines(df, text)
+    
+    if df.empty:
+        raise ValueError("No se encontraron filas de datos.")
+    
+    return df
+
+
+def _drop_blank_lines(df: pd.DataFrame, text: str) -> pd.DataFrame:
+    """
+    Drop the header row and the rows parsed from whitespace-only lines.
+    Rows whose cells are all blank are only candidates: their source line
+    is checked too, since it may have content beyond the header count.
+    
+    Args:
+        df: DataFrame parsed from text, one row per line (header included)
+        text: The text the DataFrame was parsed from
+    
+    Returns:
+        DataFrame with the data rows only, with a fresh index
+    """
+    data = df.iloc[1:]
+    blank = np.ones(len(data), dtype=bool)
+    for position in range(data.shape[1]):
+        rows = np.flatnonzero(blank)
+        if rows.size == 0:
+            break
+        values = data.iloc[rows, position].str.strip().to_numpy()
+        blank[rows[values != '']] = False
+    
+    candidates = np.flatnonzero(blank)
+    if candidates.size:
+        lines = text.split('\n')
+        blank[candidates] = [not lines[i + 1].strip() for i in candidates]
+    
+    return data[~blank].reset_index(drop=True)
+
+
 def _remove_empty_trailing_rows(df: pd.DataFrame) -> pd.DataFrame:
     """
     Remove trailing rows that are all empty, zeros, or whitespace.
@@ -249,6 +835,8 @@ def prepare_sap_from_clipboard(df: pd.DataFrame, article_column: str = 'Número
     """
     Prepare a DataFrame from clipboard to be used as SAP data.
     Normalizes the article code column and removes rows with empty article codes.
+    The input DataFrame is not modified: a new one is returned, sharing the
+    data of the other columns.
     
     Args:
         df: DataFrame parsed from clipboard
@@ -266,8 +854,8 @@ def prepare_sap_from_clipboard(df: pd.DataFrame, article_column: str = 'Número
     # Remove rows where article column is empty or invalid before normalization
     df = _remove_invalid_article_rows(df, article_column)
     
-    # Normalize the article code column
-    df[article_column] = normalize_code_column(df[article_column])
+    # Normalize the article code column (assign returns a new frame)
+    df = df.assign(**{article_column: normalize_code_column(df[article_column])})
     
     return df, article_column
 
@@ -306,10 +894,12 @@ def _remove_invalid_article_rows(df: pd.DataFrame, article_column: str) -> pd.Da
 def merge_data(df_sap: pd.DataFrame, df_cost: pd.DataFrame,
                sap_article_col: str = 'Número de artículo',
                cost_article_col: str = 'Artículo',
-               value_col: str = 'Manufactura FC') -> Tuple[pd.DataFrame, str, str]:
+               value_col: str = 'Manufactura FC',
+               skip_normalize: bool = False) -> Tuple[pd.DataFrame, str, str]:
     """
     Merge SAP data with Cost data, preserving SAP order.
-    Uses left join to keep all SAP rows.
+    Works as a left join that keeps all SAP rows: the value column is added
+    to the SAP data, NaN where the article code is not in the cost data.
     
     Args:
         df_sap: DataFrame with SAP data
@@ -317,16 +907,21 @@ def merge_data(df_sap: pd.DataFrame, df_cost: pd.DataFrame,
         sap_article_col: Name of the article column in SAP data
         cost_article_col: Name of the article column in Cost data
         value_col: Name of the value column to extract from Cost data
+        skip_normalize: Set when both article columns are already normalized
+            (e.g. by the load/prepare functions) to skip normalizing them again
     
     Returns:
         Tuple of (Merged DataFrame, sap_article_col name, value_col name)
     """
-    # Ensure both columns are normalized strings before merging
-    df_sap = df_sap.copy()
-    df_cost = df_cost.copy()
-    
-    df_sap[sap_article_col] = normalize_code_column(df_sap[sap_article_col])
-    df_cost[cost_article_col] = normalize_code_column(df_cost[cost_article_col])
+    # Shallow copies: with Copy-on-Write only the reassigned columns get new
+    # data, the other columns are shared with the caller's frames
+    df_sap = df_sap.copy(deep=False)
+    if not skip_normalize:
+        # Ensure both columns are normalized strings before merging
+        df_cost = df_cost.copy(deep=False)
+        
+        df_sap[sap_article_col] = normalize_code_column(df_sap[sap_article_col])
+        df_cost[cost_article_col] = normalize_code_column(df_cost[cost_article_col])
     
     # Remove duplicate article codes from cost file (keep first occurrence)
     # This prevents the merge from creating extra rows when cost file has duplicates
@@ -335,20 +930,76 @@ def merge_data(df_sap: pd.DataFrame, df_cost: pd.DataFrame,
         keep='first'
     )
     
-    df_merged = pd.merge(
-        df_sap,
-        df_cost_unique,
-        left_on=sap_article_col,
-        right_on=cost_article_col,
-        how='left'
-    )
+    sap_codes = df_sap[sap_article_col]
+    cost_codes = df_cost_unique[cost_article_col]
+    if (isinstance(sap_codes.dtype, pd.CategoricalDtype)
+            and isinstance(cost_codes.dtype, pd.CategoricalDtype)):
+        # Both categorical: match the categories, then join on the integer codes
+        values = _take_by_categories(sap_codes, cost_codes, df_cost_unique[value_col])
+        df_sap[value_col] = pd.Series(values, index=df_sap.index)
+        return df_sap, sap_article_col, value_col
+    
+    # With unique cost codes the left join is a lookup of each SAP code in a
+    # code -> value Series: one hash probe per row, no join columns to align
+    lookup = df_cost_unique.set_index(cost_article_col)[value_col]
+    if isinstance(lookup.index, pd.CategoricalIndex):
+        # Probing a CategoricalIndex is much slower than a plain one
+        lookup.index = lookup.index.astype(lookup.index.categories.dtype)
+    if isinstance(sap_codes.dtype, pd.CategoricalDtype):
+        # Categorical codes: look up each category once, then expand the
+        # values with the integer codes (-1, a missing code, gives NaN)
+        category_values = lookup.reindex(sap_codes.cat.categories).to_numpy()
+        values = pd.api.extensions.take(category_values, sap_codes.cat.codes.to_numpy(), allow_fill=True)
+        df_sap[value_col] = pd.Series(values, index=df_sap.index)
+    else:
+        df_sap[value_col] = sap_codes.map(lookup)
+    
+    return df_sap, sap_article_col, value_col
+
+
+def _take_by_categories(sap_codes: pd.Series, cost_codes: pd.Series,
+                        cost_values: pd.Series) -> np.ndarray:
+    """
+    Get the cost value of each SAP code, for categorical code columns.
+    Only the categories are hashed (and not at all when both columns share
+    the same categories); the rows are matched by their integer codes.
     
-    return df_merged, sap_article_col, value_col
+    Args:
+        sap_codes: Categorical SAP article codes
+        cost_codes: Categorical cost article codes, without duplicates
+        cost_values: Cost values, aligned with cost_codes
+    
+    Returns:
+        Array of values per SAP row (NaN where the code has no cost)
+    """
+    sap_categories = sap_codes.cat.categories
+    cost_categories = cost_codes.cat.categories
+    
+    # Row of the cost data for each cost category (-1 if the category is unused)
+    cost_row = np.full(len(cost_categories), -1, dtype=np.intp)
+    codes = cost_codes.cat.codes.to_numpy()
+    present = codes >= 0
+    cost_row[codes[present]] = np.flatnonzero(present)
+    
+    # Row of the cost data for each SAP category
+    if sap_categories.equals(cost_categories):
+        category_row = cost_row
+    else:
+        category = cost_categories.get_indexer(sap_categories)
+        category_row = np.full(len(sap_categories), -1, dtype=np.intp)
+        found = category >= 0
+        category_row[found] = cost_row[category[found]]
+    
+    # Row of the cost data for each SAP row (-1, a missing code, gives -1)
+    row = pd.api.extensions.take(category_row, sap_codes.cat.codes.to_numpy(),
+                                 allow_fill=True, fill_value=-1)
+    return pd.api.extensions.take(cost_values.to_numpy(), row, allow_fill=True)
 
 
 def prepare_result(df_merged: pd.DataFrame, 
                    article_col: str = 'Número de artículo',
-                   value_col: str = 'Manufactura FC') -> pd.DataFrame:
+                   value_col: str = 'Manufactura FC',
+                   downcast: bool = False) -> pd.DataFrame:
     """
     Prepare the final result DataFrame.
     Converts value column to numeric, fills NaN with 0.
@@ -357,20 +1008,120 @@ def prepare_result(df_merged: pd.DataFrame,
         df_merged: Merged DataFrame from merge_data()
         article_col: Name of the article column
         value_col: Name of the value column
+        downcast: Store the values in the smallest dtype that holds them
+            exactly (see _downcast_values)
     
     Returns:
         DataFrame with article and value columns,
         where value is numeric with 0 for missing values.
     """
-    result = df_merged[[article_col, value_col]].copy()
-    
     # Convert to numeric, coercing errors to NaN
-    result[value_col] = pd.to_numeric(result[value_col], errors='coerce')
+    values = pd.to_numeric(df_merged[value_col], errors='coerce')
     
-    # Fill NaN with 0
-    result[value_col] = result[value_col].fillna(0)
+    # Fill NaN with 0 while extracting the array (NumPy integer and bool
+    # columns cannot hold NaN and keep their dtype)
+    if isinstance(values.dtype, np.dtype) and values.dtype.kind in 'iub':
+        values = values.to_numpy()
+    else:
+        values = values.to_numpy(dtype='float64', na_value=0.0)
     
-    return result
+    if downcast:
+        values = _downcast_values(values)
+    
+    # Build the result directly, no intermediate frame (the article column is
+    # shared with df_merged under Copy-on-Write)
+    return pd.DataFrame({
+        article_col: df_merged[article_col],
+        value_col: values
+    }, index=df_merged.index, copy=False)
+
+
+def format_clipboard_values(values: pd.Series) -> str:
+    """
+    Format a column as newline-separated text, ready to paste into SAP.
+    Equivalent to joining values.fillna('').astype(str), with the
+    conversion done by NumPy on the whole array.
+    
+    Args:
+        values: Column to format (e.g. the value column of prepare_result())
+    
+    Returns:
+        One line per value, empty lines for missing values
+    """
+    # Extension dtypes (e.g. Int64) would become float with NaN, as objects
+    # their values keep their own str()
+    if isinstance(values.dtype, np.dtype):
+        array = values.to_numpy()
+    else:
+        array = values.to_numpy(dtype=object)
+    text = array.astype(str)
+    missing = pd.isna(array)
+    if missing.any():
+        text[missing] = ''
+    return '\n'.join(text.tolist())
+
+
+def _downcast_values(values: np.ndarray) -> np.ndarray:
+    """
+    Downcast numeric values to the smallest dtype that holds them exactly.
+    Whole numbers become the smallest integer type, other floats become
+    float32 only when no value changes (prices like 10.15 are not exact in
+    float32, they stay float64 so they are copied unchanged).
+    
+    Args:
+        values: NumPy array of numeric values
+    
+    Returns:
+        The downcast array (or the same array if it cannot be narrowed)
+    """
+    if values.dtype.kind in 'iu':
+        return pd.to_numeric(values, downcast='integer')
+    if values.dtype.kind != 'f' or values.size == 0:
+        return values
+    
+    if np.isfinite(values).all() and (np.floor(values) == values).all() and np.abs(values).max() < 2.0 ** 63:
+        return pd.to_numeric(values.astype(np.int64), downcast='integer')
+    
+    narrow = values.astype(np.float32)
+    if np.array_equal(narrow.astype(np.float64), values, equal_nan=True):
+        return narrow
+    return values
+
+
+def load_input_files(cost_path: str, sap_path: str,
+                     cost_article_col: str = 'Artículo',
+                     cost_value_col: str = 'Manufactura FC',
+                     sap_article_col: str = 'Número de artículo',
+                     cache_categorical: bool = False) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Load the cost and SAP files concurrently.
+    The two loads are independent and spend most of their time in the Excel
+    readers, which release the GIL, so each one runs in its own thread.
+    
+    Args:
+        cost_path: Path to the cost Excel file
+        sap_path: Path to the SAP Excel file
+        cost_article_col: Name of article column in cost file
+        cost_value_col: Name of value column in cost file
+        sap_article_col: Name of article column in SAP file
+        cache_categorical: Return the article columns as categoricals
+    
+    Returns:
+        Tuple of (cost DataFrame, SAP DataFrame), as returned by
+        load_cost_file and load_sap_file
+    
+    Raises:
+        ValueError: If required columns are missing
+        FileNotFoundError: If a file doesn't exist
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        cost_future = executor.submit(load_cost_file, cost_path, cost_article_col, cost_value_col,
+                                      cache_categorical=cache_categorical)
+        sap_future = executor.submit(load_sap_file, sap_path, sap_article_col,
+                                     cache_categorical=cache_categorical)
+        df_cost, _, _ = cost_future.result()
+        df_sap, _ = sap_future.result()
+    return df_cost, df_sap
 
 
 def process_files(cost_path: str, sap_path: str,
@@ -390,14 +1141,14 @@ def process_files(cost_path: str, sap_path: str,
     Returns:
         Result DataFrame with matched values
     """
-    df_cost, _, _ = load_cost_file(cost_path, cost_article_col, cost_value_col)
-    df_sap, _ = load_sap_file(sap_path, sap_article_col)
-    df_merged, article_col, value_col = merge_data(df_sap, df_cost, sap_article_col, cost_article_col, cost_value_col)
+    df_cost, df_sap = load_input_files(cost_path, sap_path, cost_article_col, cost_value_col, sap_article_col)
+    df_merged, article_col, value_col = merge_data(df_sap, df_cost, sap_article_col, cost_article_col, cost_value_col,
+                                                   skip_normalize=True)
     result = prepare_result(df_merged, article_col, value_col)
     return result
 
 
-def process_with_clipboard_sap(cost_path: str, sap_df: pd.DataFrame,
+def process_with_clipboard_sap(cost_path: str, sap_df: Union[pd.DataFrame, str],
                                 cost_article_col: str = 'Artículo',
                                 cost_value_col: str = 'Manufactura FC',
                                 sap_article_col: str = 'Número de artículo') -> pd.DataFrame:
@@ -406,7 +1157,8 @@ def process_with_clipboard_sap(cost_path: str, sap_df: pd.DataFrame,
     
     Args:
         cost_path: Path to the cost Excel file
-        sap_df: DataFrame from clipboard containing SAP data
+        sap_df: DataFrame from clipboard containing SAP data, or the raw
+            clipboard text (then only the article column is parsed)
         cost_article_col: Name of article column in cost file
         cost_value_col: Name of value column in cost file
         sap_article_col: Name of article column in SAP data
@@ -414,9 +1166,13 @@ def process_with_clipboard_sap(cost_path: str, sap_df: pd.DataFrame,
     Returns:
         Result DataFrame with matched values
     """
+    if isinstance(sap_df, str):
+        sap_df = parse_clipboard_single_column(sap_df, sap_article_col)
+    
     df_cost, _, _ = load_cost_file(cost_path, cost_article_col, cost_value_col)
     sap_df, _ = prepare_sap_from_clipboard(sap_df, sap_article_col)
-    df_merged, article_col, value_col = merge_data(sap_df, df_cost, sap_article_col, cost_article_col, cost_value_col)
+    df_merged, article_col, value_col = merge_data(sap_df, df_cost, sap_article_col, cost_article_col, cost_value_col,
+                                                   skip_normalize=True)
     result = prepare_result(df_merged, article_col, value_col)
     return result
 
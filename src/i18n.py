@@ -43,6 +43,8 @@ TRANSLATIONS = {
         
         # Status messages
         'rows_detected': '{count} rows detected.',
+        'preview_truncated': '(Preview of the first rows, all the data is used when accepted.)',
+        'reading_data': 'Reading all the pasted data...',
         'column_found': "Column '{column}' found.",
         'column_not_found': "Column '{column}' not found. Please verify the data.",
         'data_loaded_clipboard': '✓ SAP data loaded from clipboard ({count} rows)',
@@ -115,6 +117,8 @@ TRANSLATIONS = {
         
         # Status messages
         'rows_detected': '{count} filas detectadas.',
+        'preview_truncated': '(Vista previa de las primeras filas, se usan todos los datos al aceptar.)',
+        'reading_data': 'Leyendo todos los datos pegados...',
         'column_found': "Columna '{column}' encontrada.",
         'column_not_found': "Columna '{column}' no encontrada. Verifique los datos.",
         'data_loaded_clipboard': '✓ Datos SAP cargados desde portapapeles ({count} filas)',
@@ -151,26 +155,43 @@ TRANSLATIONS = {
 }
 
 
+# Lookup tables built once at import: every language is completed with the
+# Spanish texts for keys it lacks, so get() needs a single dict lookup
+_TEXTS = {
+    language: {**TRANSLATIONS['es'], **texts}
+    for language, texts in TRANSLATIONS.items()
+}
+
+# Bound format_map of every text with placeholders, so get() can skip
+# formatting for plain labels and avoid re-packing kwargs
+_FORMATTERS = {
+    language: {key: text.format_map for key, text in texts.items() if '{' in text}
+    for language, texts in _TEXTS.items()
+}
+
+
 class I18n:
     """Internationalization helper class."""
     
     def __init__(self, language: str = 'es'):
-        self.language = language
-        self._translations = TRANSLATIONS.get(language, TRANSLATIONS['es'])
+        self.set_language(language)
     
     def set_language(self, language: str):
         """Change the current language."""
         self.language = language
-        self._translations = TRANSLATIONS.get(language, TRANSLATIONS['es'])
+        self._translations = _TEXTS.get(language, _TEXTS['es'])
+        self._formatters = _FORMATTERS.get(language, _FORMATTERS['es'])
     
     def get(self, key: str, **kwargs) -> str:
         """Get a translated string, with optional format arguments."""
         text = self._translations.get(key, key)
         if kwargs:
-            try:
-                text = text.format(**kwargs)
-            except KeyError:
-                pass
+            formatter = self._formatters.get(key)
+            if formatter is not None:
+                try:
+                    text = formatter(kwargs)
+                except KeyError:
+                    pass
         return text
     
     def __call__(self, key: str, **kwargs) -> str:
@@ -1,41 +1,64 @@
+import hashlib
+import os
+import re
+import threading
 import tkinter as tk
+import tkinter.font as tkfont
 from tkinter import filedialog, messagebox, ttk
-import pandas as pd
-import os
+
+from pandas.errors import PyperclipException
 
 from handlers import (
-    normalize_code_column,
     load_cost_file,
+    load_input_files,
     load_sap_file,
     parse_clipboard_data,
     prepare_sap_from_clipboard,
     merge_data,
     prepare_result,
+    format_clipboard_values,
     get_excel_columns,
+    find_column,
 )
 from i18n import i18n
 
+# Column name patterns used to auto-select columns, highest priority first
+ARTICLE_COLUMN_PATTERNS = [re.compile(r'art[ií]culo|article', re.I), re.compile(r'n[úu]mero', re.I)]
+VALUE_COLUMN_PATTERNS = [re.compile(p, re.I) for p in (r'manufactura', r'costo', r'\bfc\b')]
+
+# Pasted characters parsed for the preview; larger pastes are parsed in full on accept
+PREVIEW_CHAR_LIMIT = 256 * 1024
+
 
 class ColumnConfigDialog:
-    """Dialog for configuring which columns to use for matching."""
+    """
+    Dialog for configuring which columns to use for matching.
+    The window is created once (hidden) and reused: show() fills it with
+    the current columns and configuration, closing only hides it.
+    """
     
-    def __init__(self, parent, cost_columns, sap_columns, current_config):
+    def __init__(self, parent):
         self.parent = parent
-        self.cost_columns = cost_columns
-        self.sap_columns = sap_columns
         self.result = None
         
         # Create dialog window
         self.dialog = tk.Toplevel(parent)
+        self.dialog.withdraw()
         self.dialog.title(i18n('column_config_title'))
         self.dialog.geometry("500x300")
         self.dialog.transient(parent)
-        self.dialog.grab_set()
+        self.dialog.protocol("WM_DELETE_WINDOW", self.cancel)
+        
+        # Variables with current values (set by show())
+        self.cost_article_var = tk.StringVar()
+        self.cost_value_var = tk.StringVar()
+        self.sap_article_var = tk.StringVar()
         
-        # Variables with current values
-        self.cost_article_var = tk.StringVar(value=current_config.get('cost_article', ''))
-        self.cost_value_var = tk.StringVar(value=current_config.get('cost_value', ''))
-        self.sap_article_var = tk.StringVar(value=current_config.get('sap_article', ''))
+        # Column lists last given to each combobox, see set_values()
+        self._combo_values = {}
+        
+        # Set when the dialog is closed, show() waits for it
+        self._closed = tk.BooleanVar(value=False)
         
         self.create_widgets()
         
@@ -57,40 +80,37 @@ class ColumnConfigDialog:
         ttk.Label(config_frame, text=i18n('cost_article_column')).grid(
             row=0, column=0, sticky="w", pady=5
         )
-        cost_article_combo = ttk.Combobox(
+        self.cost_article_combo = ttk.Combobox(
             config_frame, 
             textvariable=self.cost_article_var,
-            values=self.cost_columns,
             state="readonly",
             width=30
         )
-        cost_article_combo.grid(row=0, column=1, sticky="ew", pady=5, padx=10)
+        self.cost_article_combo.grid(row=0, column=1, sticky="ew", pady=5, padx=10)
         
         # Cost file - Value column
         ttk.Label(config_frame, text=i18n('cost_value_column')).grid(
             row=1, column=0, sticky="w", pady=5
         )
-        cost_value_combo = ttk.Combobox(
+        self.cost_value_combo = ttk.Combobox(
             config_frame,
             textvariable=self.cost_value_var,
-            values=self.cost_columns,
             state="readonly",
             width=30
         )
-        cost_value_combo.grid(row=1, column=1, sticky="ew", pady=5, padx=10)
+        self.cost_value_combo.grid(row=1, column=1, sticky="ew", pady=5, padx=10)
         
         # SAP file - Article column
         ttk.Label(config_frame, text=i18n('sap_article_column')).grid(
             row=2, column=0, sticky="w", pady=5
         )
-        sap_article_combo = ttk.Combobox(
+        self.sap_article_combo = ttk.Combobox(
             config_frame,
             textvariable=self.sap_article_var,
-            values=self.sap_columns,
             state="readonly",
             width=30
         )
-        sap_article_combo.grid(row=2, column=1, sticky="ew", pady=5, padx=10)
+        self.sap_article_combo.grid(row=2, column=1, sticky="ew", pady=5, padx=10)
         
         config_frame.columnconfigure(1, weight=1)
         
@@ -119,32 +139,75 @@ class ColumnConfigDialog:
             'cost_value': cost_value,
             'sap_article': sap_article
         }
-        self.dialog.destroy()
+        self.close()
     
     def cancel(self):
         """Cancel and close dialog."""
         self.result = None
-        self.dialog.destroy()
+        self.close()
     
-    def show(self):
-        """Show dialog and wait for result."""
-        self.dialog.wait_window()
+    def close(self):
+        """Hide the dialog, keeping it for the next show()."""
+        self.dialog.grab_release()
+        self.dialog.withdraw()
+        self._closed.set(True)
+    
+    def set_values(self, combo, columns):
+        """Set the combobox choices, skipping the Tcl list conversion when unchanged."""
+        columns = tuple(columns)
+        if self._combo_values.get(combo) != columns:
+            combo.config(values=columns)
+            self._combo_values[combo] = columns
+    
+    def show(self, cost_columns, sap_columns, current_config):
+        """Show dialog with the given columns and configuration, and wait for result."""
+        self.result = None
+        self.set_values(self.cost_article_combo, cost_columns)
+        self.set_values(self.cost_value_combo, cost_columns)
+        self.set_values(self.sap_article_combo, sap_columns)
+        self.cost_article_var.set(current_config.get('cost_article', ''))
+        self.cost_value_var.set(current_config.get('cost_value', ''))
+        self.sap_article_var.set(current_config.get('sap_article', ''))
+        
+        self._closed.set(False)
+        self.dialog.deiconify()
+        self.dialog.grab_set()
+        self.dialog.wait_variable(self._closed)
         return self.result
 
 
 class ClipboardPasteDialog:
-    """Dialog for pasting SAP data from clipboard."""
+    """
+    Dialog for pasting SAP data from clipboard.
+    Created once (hidden) and reused like ColumnConfigDialog; the pasted
+    text and preview are cleared when it closes.
+    """
+    
+    # Options of every preview column, applied in one column() call each
+    PREVIEW_COLUMN_OPTIONS = {'width': 100, 'minwidth': 0, 'stretch': False}
     
     def __init__(self, parent):
         self.parent = parent
         self.result_df = None
+        self._preview_df = None
+        self._dirty = False  # Text changed since the last preview
+        self._preview_digest = None  # Hash of the last previewed text, to skip re-parsing it
+        self._preview_truncated = False  # The preview parsed only the first PREVIEW_CHAR_LIMIT chars
+        self._preview_columns = ()  # Columns configured in the preview tree
+        self._parse_jobs = 0  # Full parses started
+        self._parse_job = None  # Running full parse, None when stopped (closed or text changed)
+        self._preview_after_id = None  # Pending debounced preview
         
         # Create dialog window
         self.dialog = tk.Toplevel(parent)
+        self.dialog.withdraw()
         self.dialog.title(i18n('paste_dialog_title'))
         self.dialog.geometry("800x500")
         self.dialog.transient(parent)
-        self.dialog.grab_set()
+        self.dialog.protocol("WM_DELETE_WINDOW", self.cancel)
+        
+        # Set when the dialog is closed, show() waits for it
+        self._closed = tk.BooleanVar(value=False)
         
         self.create_widgets()
         
@@ -169,17 +232,22 @@ class ClipboardPasteDialog:
         text_scrollbar.pack(side="right", fill="y")
         
         # Bind paste event to auto-preview
-        self.text_area.bind("<<Paste>>", lambda e: self.dialog.after(100, self.preview_data))
-        self.text_area.bind("<KeyRelease>", lambda e: self.dialog.after(100, self.preview_data))
+        self.text_area.bind("<<Paste>>", self.schedule_preview)
+        self.text_area.bind("<KeyRelease>", self.schedule_preview)
+        self.text_area.bind("<<Modified>>", self.on_modified)
         
         # Preview button
         btn_frame = ttk.Frame(self.dialog, padding=(10, 5))
         btn_frame.pack(fill="x")
         
         ttk.Button(btn_frame, text=i18n('preview'), command=self.preview_data).pack(side="left", padx=5)
-        ttk.Button(btn_frame, text=i18n('use_data'), command=self.accept_data).pack(side="left", padx=5)
+        self.use_btn = ttk.Button(btn_frame, text=i18n('use_data'), command=self.accept_data)
+        self.use_btn.pack(side="left", padx=5)
         ttk.Button(btn_frame, text=i18n('cancel'), command=self.cancel).pack(side="left", padx=5)
         
+        # Shown (packed) while a large paste is parsed in full
+        self.progress = ttk.Progressbar(btn_frame, mode="indeterminate", length=150)
+        
         # Status label
         self.status_label = ttk.Label(self.dialog, text="", padding=(10, 5))
         self.status_label.pack(fill="x")
@@ -195,31 +263,76 @@ class ClipboardPasteDialog:
         self.preview_tree.configure(yscrollcommand=preview_scrollbar.set)
         preview_scrollbar.pack(side="right", fill="y")
     
+    def on_modified(self, event=None):
+        """Mark the text dirty and re-arm the Text modified flag."""
+        # Resetting the flag fires <<Modified>> again, with the flag cleared
+        if self.text_area.edit_modified():
+            self._dirty = True
+            self.text_area.edit_modified(False)
+            # A running full parse is for the previous text
+            if self._parse_job is not None:
+                self.stop_progress()
+    
+    def schedule_preview(self, event=None):
+        """Preview once typing pauses: each new event restarts the delay."""
+        if self._preview_after_id is not None:
+            self.dialog.after_cancel(self._preview_after_id)
+        self._preview_after_id = self.dialog.after(250, self.preview_data)
+    
     def preview_data(self):
         """Parse and preview the pasted data."""
-        text = self.text_area.get("1.0", tk.END)
+        self._preview_after_id = None
+        
+        # Nothing to do if the text did not change (e.g. arrow keys), so
+        # the buffer is not copied out of the widget on every keystroke
+        if not self._dirty:
+            return
+        self._dirty = False
+        
+        # Large pastes: preview only the complete lines of the first chars
+        limit = f"1.0+{PREVIEW_CHAR_LIMIT}c"
+        truncated = self.text_area.compare(limit, "<", "end-1c")
+        if truncated:
+            text = self.text_area.get("1.0", limit)
+            text = text[:text.rfind("\n") + 1]
+        else:
+            text = self.text_area.get("1.0", tk.END)
+        
+        # Edits that restore the previewed text (e.g. undo) need no re-parse
+        digest = (hashlib.blake2b(text.encode(), digest_size=8).digest(), truncated)
+        if digest == self._preview_digest:
+            return
+        self._preview_digest = digest
+        self._preview_truncated = truncated
         
         try:
             df = parse_clipboard_data(text)
             
-            # Clear current preview
-            self.preview_tree.delete(*self.preview_tree.get_children())
-            
-            # Configure columns
-            self.preview_tree["columns"] = list(df.columns)
-            for col in df.columns:
-                self.preview_tree.heading(col, text=col)
-                self.preview_tree.column(col, width=100)
+            # Configure columns (unless they are the same as the last preview)
+            columns = tuple(df.columns)
+            if columns != self._preview_columns:
+                self.preview_tree["columns"] = columns
+                for col in columns:
+                    self.preview_tree.heading(col, text=col)
+                    self.preview_tree.column(col, **self.PREVIEW_COLUMN_OPTIONS)
+                self._preview_columns = columns
             
-            # Add rows (limit to first 20 for preview)
-            for idx, row in df.head(20).iterrows():
-                self.preview_tree.insert("", "end", values=list(row))
+            # Show the rows (limit to first 20 for preview) in the items of the
+            # last preview, inserting or deleting only the difference
+            rows = df.head(20).to_numpy().tolist()
+            items = self.preview_tree.get_children()
+            if len(items) > len(rows):
+                self.preview_tree.delete(*items[len(rows):])
+            for item, row in zip(items, rows):
+                self.preview_tree.item(item, values=row)
+            for row in rows[len(items):]:
+                self.preview_tree.insert("", "end", values=row)
             
             # Just show success - column selection is done in config dialog
-            self.status_label.config(
-                text=f"✓ {i18n('rows_detected', count=len(df))}",
-                foreground="green"
-            )
+            status = f"✓ {i18n('rows_detected', count=len(df))}"
+            if truncated:
+                status += f" {i18n('preview_truncated')}"
+            self.status_label.config(text=status, foreground="green")
             self._preview_df = df
                 
         except ValueError as e:
@@ -231,26 +344,281 @@ class ClipboardPasteDialog:
     
     def accept_data(self):
         """Accept the parsed data and close dialog."""
-        if hasattr(self, '_preview_df') and self._preview_df is not None:
-            self.result_df = self._preview_df
-            self.dialog.destroy()
-        else:
+        # Run a pending preview now, so the latest text is the one accepted
+        if self._preview_after_id is not None:
+            self.dialog.after_cancel(self._preview_after_id)
+            self.preview_data()
+        
+        if self._preview_df is None:
             messagebox.showwarning(
                 i18n('invalid_data'),
                 i18n('paste_valid_data')
             )
+        elif not self._preview_truncated:
+            self.result_df = self._preview_df
+            self.close()
+        else:
+            self.start_full_parse()
+    
+    def start_full_parse(self):
+        """Parse the whole pasted text in a background thread."""
+        self._parse_jobs += 1
+        self._parse_job = self._parse_jobs
+        text = self.text_area.get("1.0", tk.END)
+        
+        self.use_btn.config(state="disabled")
+        self.progress.pack(side="left", padx=5)
+        self.progress.start()
+        self.status_label.config(text=i18n('reading_data'), foreground="")
+        
+        threading.Thread(target=self._full_parse_worker, args=(self._parse_job, text),
+                         daemon=True).start()
+    
+    def _full_parse_worker(self, job, text):
+        """Thread target: parse the text and hand the outcome to the Tk thread."""
+        try:
+            df = parse_clipboard_data(text)
+        except Exception as e:
+            self.dialog.after(0, self._finish_full_parse, job, None, e)
+        else:
+            self.dialog.after(0, self._finish_full_parse, job, df, None)
+    
+    def _finish_full_parse(self, job, df, error):
+        """Accept the fully parsed data (on the Tk thread)."""
+        # Closed, or the text changed, while parsing
+        if job != self._parse_job:
+            return
+        self.stop_progress()
+        
+        if error is not None:
+            self.status_label.config(text=f"✗ {i18n('error')}: {str(error)}", foreground="red")
+            return
+        self.result_df = df
+        self.close()
+    
+    def stop_progress(self):
+        """Stop waiting for a full parse and hide its progress bar."""
+        self._parse_job = None
+        self.progress.stop()
+        self.progress.pack_forget()
+        self.use_btn.config(state="normal")
     
     def cancel(self):
         """Cancel and close dialog."""
         self.result_df = None
-        self.dialog.destroy()
+        self.close()
+    
+    def close(self):
+        """Hide the dialog and clear it for the next show()."""
+        if self._preview_after_id is not None:
+            self.dialog.after_cancel(self._preview_after_id)
+            self._preview_after_id = None
+        
+        # Drop the pasted text and preview, they can be large
+        self.text_area.delete("1.0", tk.END)
+        self.preview_tree.delete(*self.preview_tree.get_children())
+        self.preview_tree["columns"] = ()
+        self._preview_columns = ()
+        self.status_label.config(text="")
+        self._dirty = False
+        self._preview_digest = None
+        self._preview_truncated = False
+        self._preview_df = None
+        self.stop_progress()
+        
+        self.dialog.grab_release()
+        self.dialog.withdraw()
+        self._closed.set(True)
     
     def show(self):
         """Show dialog and wait for result."""
-        self.dialog.wait_window()
+        self.result_df = None
+        self._closed.set(False)
+        self.dialog.deiconify()
+        self.dialog.grab_set()
+        self.text_area.focus_set()
+        self.dialog.wait_variable(self._closed)
         return self.result_df
 
 
+class VirtualTable:
+    """
+    Read-only table for large DataFrames.
+    A Treeview holds only as many rows as fit in the window; scrolling
+    rewrites their values from the DataFrame, so the widget size does not
+    depend on the number of rows. The selected row and keyboard navigation
+    are tracked as DataFrame rows, since the Treeview items are reused.
+    """
+    
+    def __init__(self, parent, columns):
+        """
+        Args:
+            parent: Parent widget
+            columns: Treeview column ids
+        """
+        self.df = None
+        self.data_columns = []
+        self.top = 0  # DataFrame row shown in the first Treeview row
+        self.visible_rows = 1
+        self.selected = None  # Selected DataFrame row
+        self._height = 0  # Treeview height in pixels, from <Configure>
+        
+        self.tree = ttk.Treeview(parent, columns=columns, show="headings", selectmode="browse")
+        # macOS reports wheel deltas in notches, Windows in 1/120 notches
+        self._wheel_in_notches = self.tree.tk.call("tk", "windowingsystem") == "aqua"
+        self._wheel_delta = 0  # Windows deltas not yet adding up to a notch
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.yview)
+        
+        self.tree.bind("<Configure>", self.on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        # The Treeview's own scrolling is replaced by moving self.top
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(3))
+        # The default key bindings only move within the shown items
+        self.tree.bind("<Up>", lambda e: self.move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self.move_selection(1))
+        self.tree.bind("<Prior>", lambda e: self.move_selection(-self.visible_rows))
+        self.tree.bind("<Next>", lambda e: self.move_selection(self.visible_rows))
+        self.tree.bind("<Home>", lambda e: self.move_selection(-self.row_count()))
+        self.tree.bind("<End>", lambda e: self.move_selection(self.row_count()))
+    
+    def pack(self):
+        """Pack the table and its scrollbar in the parent."""
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+    
+    def set_data(self, df, data_columns):
+        """Show the given DataFrame columns (one per Treeview column)."""
+        self.df = df
+        self.data_columns = list(data_columns)
+        self.top = 0
+        self.selected = None
+        self.render()
+        # Measure the rows once they are laid out
+        self.tree.after_idle(self.fit_rows)
+    
+    def row_count(self):
+        """Number of DataFrame rows (0 when there is no data)."""
+        return 0 if self.df is None else len(self.df)
+    
+    def on_resize(self, event):
+        """Recompute how many rows fit in the Treeview."""
+        self._height = event.height
+        self.fit_rows()
+    
+    def fit_rows(self):
+        """Set visible_rows from the measured row layout, re-rendering if it changed."""
+        items = self.tree.get_children()
+        bbox = self.tree.bbox(items[0]) if items else ""
+        if bbox:
+            # The first row starts below the heading and top border; the
+            # bottom border is taken to be as wide as the left one
+            x, first_y, _, row_height = bbox
+            available = self._height - first_y - x
+        else:
+            # Nothing shown yet: estimate, with the heading as tall as a row
+            row_height = self.row_height()
+            available = self._height - row_height
+        
+        visible_rows = max(1, available // max(1, row_height))
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.render()
+            if not bbox:
+                self.tree.after_idle(self.fit_rows)
+    
+    def row_height(self):
+        """Row height from the style, or from the font when the theme does not set it."""
+        row_height = ttk.Style().lookup("Treeview", "rowheight")
+        if row_height:
+            return int(row_height)
+        font = ttk.Style().lookup("Treeview", "font") or "TkDefaultFont"
+        return tkfont.nametofont(font).metrics("linespace") + 2
+    
+    def on_mousewheel(self, event):
+        """Scroll 3 rows per wheel notch."""
+        if self._wheel_in_notches:
+            notches = event.delta
+        else:
+            # Touchpads and smooth-scroll mice send fractions of 120:
+            # accumulate them and scroll once they add up to whole notches
+            self._wheel_delta += event.delta
+            notches = int(self._wheel_delta / 120)
+            self._wheel_delta -= notches * 120
+        if notches:
+            self.scroll(-3 * notches)
+        return "break"
+    
+    def on_select(self, event):
+        """Remember the clicked row as a DataFrame row."""
+        selection = self.tree.selection()
+        # Empty when render() hid the selected row, which stays selected
+        if selection:
+            self.selected = self.top + self.tree.index(selection[0])
+    
+    def move_selection(self, rows):
+        """Move the selected row (or the view, with no selection) and keep it shown."""
+        total = self.row_count()
+        if self.selected is None or not total:
+            return self.scroll(rows)
+        
+        self.selected = max(0, min(self.selected + rows, total - 1))
+        if self.selected < self.top:
+            self.top = self.selected
+        elif self.selected >= self.top + self.visible_rows:
+            self.top = self.selected - self.visible_rows + 1
+        self.render()
+        return "break"
+    
+    def scroll(self, rows):
+        """Move the shown rows by the given number of rows."""
+        self.top += rows
+        self.render()
+        return "break"
+    
+    def yview(self, *args):
+        """Scrollbar command ("moveto", fraction or "scroll", n, units|pages)."""
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * self.row_count())
+        elif args[0] == "scroll":
+            step = self.visible_rows if args[2] == "pages" else 1
+            self.top += int(args[1]) * step
+        self.render()
+    
+    def render(self):
+        """Fill the Treeview rows with the DataFrame rows from self.top."""
+        total = self.row_count()
+        self.top = max(0, min(self.top, total - self.visible_rows))
+        count = min(self.visible_rows, total - self.top)
+        
+        # Keep exactly one Treeview item per shown row
+        items = self.tree.get_children()
+        if len(items) > count:
+            self.tree.delete(*items[count:])
+            items = items[:count]
+        items = list(items) + [self.tree.insert("", "end") for _ in range(count - len(items))]
+        
+        if count:
+            # tolist() converts the slice to Python values in one C pass
+            rows = self.df[self.data_columns].iloc[self.top:self.top + count].to_numpy().tolist()
+            for item, row in zip(items, rows):
+                self.tree.item(item, values=row)
+        
+        # The selection follows its DataFrame row, not the reused item
+        if self.selected is not None and self.top <= self.selected < self.top + count:
+            item = items[self.selected - self.top]
+            self.tree.selection_set(item)
+            self.tree.focus(item)
+        elif self.tree.selection():
+            self.tree.selection_set(())
+        
+        if total:
+            self.scrollbar.set(self.top / total, (self.top + count) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+
 class SapPriceUpdaterApp:
     def __init__(self, root):
         self.root = root
@@ -262,6 +630,15 @@ class SapPriceUpdaterApp:
         self.sap_file_path = tk.StringVar()
         self.df_result = None
         self.sap_from_clipboard = None  # Store SAP data from clipboard
+        self.processing = False  # A background run of process_files is active
+        
+        # Last loaded cost and SAP frames, reused while the file and columns
+        # are unchanged: {'cost'|'sap': (key, DataFrame)}
+        self._loaded_frames = {}
+        
+        # Dialogs, created on first use and reused (see configure_columns)
+        self._config_dialog = None
+        self._paste_dialog = None
         
         # Column configuration (defaults)
         self.column_config = {
@@ -350,48 +727,59 @@ class SapPriceUpdaterApp:
         self.table_frame.pack(fill="both", expand=True, padx=10, pady=5)
 
         # Treeview for dataframe
-        self.tree = ttk.Treeview(self.table_frame, columns=("Articulo", "Value"), show="headings")
+        self.table = VirtualTable(self.table_frame, columns=("Articulo", "Value"))
+        self.tree = self.table.tree
         self.tree.heading("Articulo", text=i18n('article_sap'))
         self.tree.heading("Value", text=i18n('manufacturing_cost'))
-        self.tree.column("Articulo", width=200)
-        self.tree.column("Value", width=200)
+        # Fixed widths: Tk does not re-layout the columns as the shown rows change
+        self.tree.column("Articulo", width=200, minwidth=0, stretch=False)
+        self.tree.column("Value", width=200, minwidth=0, stretch=False)
         
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(self.table_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
-        
-        self.tree.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        # Only the visible rows live in the Treeview (see VirtualTable)
+        self.table.pack()
 
     def change_language(self, event=None):
         """Change the application language and refresh UI."""
         new_lang = self.lang_var.get()
         i18n.set_language(new_lang)
         self.refresh_ui_text()
+        
+        # Cached dialogs hold texts in the old language, rebuild them on demand
+        for dialog in (self._config_dialog, self._paste_dialog):
+            if dialog is not None:
+                dialog.dialog.destroy()
+        self._config_dialog = None
+        self._paste_dialog = None
     
     def refresh_ui_text(self):
         """Refresh all UI text with current language."""
-        self.root.title(i18n('app_title'))
+        # Look each text up once, 'browse' is shared by two buttons
+        tr = {key: i18n(key) for key in (
+            'app_title', 'file_selection', 'results', 'cost_file_label', 'sap_file_label',
+            'browse', 'paste', 'configure_columns', 'process_files', 'copy_to_clipboard',
+            'article_sap', 'manufacturing_cost',
+        )}
+        self.root.title(tr['app_title'])
         
         # Update frame labels
-        self.input_frame.config(text=i18n('file_selection'))
-        self.table_frame.config(text=i18n('results'))
+        self.input_frame.config(text=tr['file_selection'])
+        self.table_frame.config(text=tr['results'])
         
         # Update labels
-        self.cost_label.config(text=i18n('cost_file_label'))
-        self.sap_label.config(text=i18n('sap_file_label'))
+        self.cost_label.config(text=tr['cost_file_label'])
+        self.sap_label.config(text=tr['sap_file_label'])
         
         # Update buttons
-        self.cost_browse_btn.config(text=i18n('browse'))
-        self.sap_browse_btn.config(text=i18n('browse'))
-        self.sap_paste_btn.config(text=i18n('paste'))
-        self.config_btn.config(text=i18n('configure_columns'))
-        self.process_btn.config(text=i18n('process_files'))
-        self.copy_btn.config(text=i18n('copy_to_clipboard'))
+        self.cost_browse_btn.config(text=tr['browse'])
+        self.sap_browse_btn.config(text=tr['browse'])
+        self.sap_paste_btn.config(text=tr['paste'])
+        self.config_btn.config(text=tr['configure_columns'])
+        self.process_btn.config(text=tr['process_files'])
+        self.copy_btn.config(text=tr['copy_to_clipboard'])
         
         # Update table headers
-        self.tree.heading("Articulo", text=i18n('article_sap'))
-        self.tree.heading("Value", text=i18n('manufacturing_cost'))
+        self.tree.heading("Articulo", text=tr['article_sap'])
+        self.tree.heading("Value", text=tr['manufacturing_cost'])
         
         # Refresh column status if configured
         if self.cost_columns and self.sap_columns:
@@ -425,13 +813,13 @@ class SapPriceUpdaterApp:
             )
             return
         
-        dialog = ColumnConfigDialog(
-            self.root,
+        if self._config_dialog is None:
+            self._config_dialog = ColumnConfigDialog(self.root)
+        result = self._config_dialog.show(
             self.cost_columns,
             self.sap_columns,
             self.column_config
         )
-        result = dialog.show()
         
         if result:
             self.column_config = result
@@ -439,8 +827,9 @@ class SapPriceUpdaterApp:
 
     def paste_sap_from_clipboard(self):
         """Open dialog to paste SAP data from clipboard."""
-        dialog = ClipboardPasteDialog(self.root)
-        result_df = dialog.show()
+        if self._paste_dialog is None:
+            self._paste_dialog = ClipboardPasteDialog(self.root)
+        result_df = self._paste_dialog.show()
         
         if result_df is not None:
             self.sap_from_clipboard = result_df
@@ -453,39 +842,34 @@ class SapPriceUpdaterApp:
             self.sap_columns = list(result_df.columns)
             
             # Try to auto-select a matching column
-            for col in self.sap_columns:
-                if 'artículo' in col.lower() or 'articulo' in col.lower() or 'article' in col.lower() or 'número' in col.lower():
-                    self.column_config['sap_article'] = col
-                    break
+            self.auto_select_column('sap_article', self.sap_columns, ARTICLE_COLUMN_PATTERNS)
             
             self.check_enable_config_button()
         else:
             # User cancelled, keep previous state
             pass
 
+    def auto_select_column(self, config_key, columns, patterns):
+        """Set a column of the configuration to the best matching column, if any."""
+        column = find_column(columns, patterns)
+        if column is not None:
+            self.column_config[config_key] = column
+
     def browse_cost_file(self):
         filename = filedialog.askopenfilename(filetypes=[("Excel Files", "*.xlsx *.xls")])
         if filename:
             self.cost_file_path.set(filename)
             try:
-                # Try to load columns from the file
-                self.cost_columns = get_excel_columns(filename, 'COSTO PROD')
+                # Try to load columns from the file (first sheet if there is no COSTO PROD)
+                self.cost_columns = get_excel_columns(filename, 'COSTO PROD', fallback_to_first_sheet=True)
                 
                 # Try to auto-select matching columns
-                for col in self.cost_columns:
-                    if 'artículo' in col.lower() or 'articulo' in col.lower():
-                        self.column_config['cost_article'] = col
-                    if 'manufactura' in col.lower() or 'costo' in col.lower() or 'fc' in col.lower():
-                        self.column_config['cost_value'] = col
+                self.auto_select_column('cost_article', self.cost_columns, ARTICLE_COLUMN_PATTERNS[:1])
+                self.auto_select_column('cost_value', self.cost_columns, VALUE_COLUMN_PATTERNS)
                 
                 self.check_enable_config_button()
-            except Exception as e:
-                # If we can't read the sheet, try without sheet name
-                try:
-                    self.cost_columns = get_excel_columns(filename)
-                    self.check_enable_config_button()
-                except:
-                    self.cost_columns = []
+            except Exception:
+                self.cost_columns = []
 
     def browse_sap_file(self):
         filename = filedialog.askopenfilename(filetypes=[("Excel Files", "*.xlsx *.xls")])
@@ -499,16 +883,17 @@ class SapPriceUpdaterApp:
                 self.sap_columns = get_excel_columns(filename)
                 
                 # Try to auto-select a matching column
-                for col in self.sap_columns:
-                    if 'artículo' in col.lower() or 'articulo' in col.lower() or 'article' in col.lower() or 'número' in col.lower():
-                        self.column_config['sap_article'] = col
-                        break
+                self.auto_select_column('sap_article', self.sap_columns, ARTICLE_COLUMN_PATTERNS)
                 
                 self.check_enable_config_button()
             except:
                 self.sap_columns = []
 
     def process_files(self):
+        # Ignore clicks while a previous run is still processing
+        if self.processing:
+            return
+        
         cost_path = self.cost_file_path.get()
         sap_path = self.sap_file_path.get()
 
@@ -522,49 +907,98 @@ class SapPriceUpdaterApp:
             messagebox.showwarning(i18n('missing_sap'), i18n('missing_sap_data'))
             return
 
+        # The worker gets a snapshot of the inputs, it must not touch Tk objects
+        job = (cost_path, sap_path, dict(self.column_config), self.sap_from_clipboard)
+        self.processing = True
+        self.process_btn.config(state="disabled")
+        threading.Thread(target=self._run_worker, args=job, daemon=True).start()
+
+    def _process_files_worker(self, cost_path, sap_path, column_config, sap_from_clipboard):
+        """Run the processing pipeline (in a background thread)."""
+        # Get column configuration
+        cost_article_col = column_config['cost_article']
+        cost_value_col = column_config['cost_value']
+        sap_article_col = column_config['sap_article']
+        
+        # Reuse the frames of a previous run when the files did not change.
+        # They are loaded with categorical article codes, so repeated merges
+        # look up each distinct code once instead of hashing every row.
+        cost_key = (cost_path, os.path.getmtime(cost_path), cost_article_col, cost_value_col)
+        dfCost = self._get_loaded_frame('cost', cost_key)
+        
+        # Load Cost data and SAP data from file (in parallel) or use clipboard data
+        if sap_from_clipboard is not None:
+            if dfCost is None:
+                dfCost, _, _ = load_cost_file(cost_path, cost_article_col, cost_value_col,
+                                              cache_categorical=True)
+            dfSap, _ = prepare_sap_from_clipboard(sap_from_clipboard, sap_article_col)
+        else:
+            sap_key = (sap_path, os.path.getmtime(sap_path), sap_article_col)
+            dfSap = self._get_loaded_frame('sap', sap_key)
+            if dfCost is None and dfSap is None:
+                dfCost, dfSap = load_input_files(cost_path, sap_path,
+                                                 cost_article_col, cost_value_col, sap_article_col,
+                                                 cache_categorical=True)
+            elif dfCost is None:
+                dfCost, _, _ = load_cost_file(cost_path, cost_article_col, cost_value_col,
+                                              cache_categorical=True)
+            elif dfSap is None:
+                dfSap, _ = load_sap_file(sap_path, sap_article_col, cache_categorical=True)
+            self._loaded_frames['sap'] = (sap_key, dfSap)
+        self._loaded_frames['cost'] = (cost_key, dfCost)
+        
+        # Merge data using handler
+        df_merged, article_col, value_col = merge_data(
+            dfSap, dfCost, 
+            sap_article_col, cost_article_col, cost_value_col,
+            skip_normalize=True
+        )
+        
+        # Prepare result using handler
+        df_result = prepare_result(df_merged, article_col, value_col)
+        return df_result, article_col, value_col
+
+    def _get_loaded_frame(self, kind, key):
+        """Get the frame loaded by a previous run if it was for the same key."""
+        cached_key, df = self._loaded_frames.get(kind, (None, None))
+        return df if cached_key == key else None
+
+    def _run_worker(self, *job):
+        """Thread target: run the pipeline and hand the outcome to the Tk thread."""
         try:
-            # Get column configuration
-            cost_article_col = self.column_config['cost_article']
-            cost_value_col = self.column_config['cost_value']
-            sap_article_col = self.column_config['sap_article']
-            
-            # Load Cost data using handler
-            dfCost, _, _ = load_cost_file(cost_path, cost_article_col, cost_value_col)
-            
-            # Load SAP data from file or use clipboard data
-            if self.sap_from_clipboard is not None:
-                dfSap, _ = prepare_sap_from_clipboard(self.sap_from_clipboard.copy(), sap_article_col)
-            else:
-                dfSap, _ = load_sap_file(sap_path, sap_article_col)
-
-            # Merge data using handler
-            df_merged, article_col, value_col = merge_data(
-                dfSap, dfCost, 
-                sap_article_col, cost_article_col, cost_value_col
-            )
-            
-            # Prepare result using handler
-            self.df_result = prepare_result(df_merged, article_col, value_col)
-            
-            # Store column names for display
-            self.result_article_col = article_col
-            self.result_value_col = value_col
+            result = self._process_files_worker(*job)
+        except Exception as e:
+            self.root.after(0, self._show_process_error, e)
+        else:
+            self.root.after(0, self._apply_result, *result)
 
-            # Clear current table
-            for i in self.tree.get_children():
-                self.tree.delete(i)
+    def _finish_processing(self):
+        """Allow processing again."""
+        self.processing = False
+        self.process_btn.config(state="normal")
 
-            # Populate table
-            for index, row in self.df_result.iterrows():
-                self.tree.insert("", "end", values=(row[article_col], row[value_col]))
+    def _apply_result(self, df_result, article_col, value_col):
+        """Show a processed result (on the Tk thread)."""
+        self._finish_processing()
+        self.df_result = df_result
+        
+        # Store column names for display
+        self.result_article_col = article_col
+        self.result_value_col = value_col
 
-            messagebox.showinfo(i18n('success'), i18n('processed_rows', count=len(self.df_result)))
+        # Populate table
+        self.table.set_data(self.df_result, [article_col, value_col])
+        
+        messagebox.showinfo(i18n('success'), i18n('processed_rows', count=len(self.df_result)))
 
-        except ValueError as e:
+    def _show_process_error(self, e):
+        """Report an error raised by the pipeline (on the Tk thread)."""
+        self._finish_processing()
+        if isinstance(e, ValueError):
             messagebox.showerror(i18n('validation_error'), str(e))
-        except FileNotFoundError as e:
+        elif isinstance(e, FileNotFoundError):
             messagebox.showerror(i18n('file_not_found'), str(e))
-        except Exception as e:
+        else:
             messagebox.showerror(i18n('error'), i18n('error_occurred', error=str(e)))
 
     def copy_to_clipboard(self):
@@ -575,14 +1009,22 @@ class SapPriceUpdaterApp:
         try:
             # Extract the value column
             value_col = self.result_value_col if hasattr(self, 'result_value_col') else 'Manufactura FC'
-            data_to_copy = self.df_result[value_col].fillna('')
             
-            # Convert to string and join with newlines
-            clipboard_text = '\n'.join(data_to_copy.astype(str).tolist())
-            
-            self.root.clipboard_clear()
-            self.root.clipboard_append(clipboard_text)
-            self.root.update()
+            try:
+                # Native clipboard (Windows API, pbcopy, xclip/xsel/wl-copy),
+                # one tab-separated text with no round-trip through Tcl.
+                # A single-column to_csv writes missing values as "", which
+                # cannot happen here: prepare_result fills them with 0.
+                self.df_result[[value_col]].to_clipboard(index=False, header=False)
+            except (ImportError, PyperclipException):
+                # No clipboard mechanism available: use Tk's clipboard
+                clipboard_text = format_clipboard_values(self.df_result[value_col])
+                
+                self.root.clipboard_clear()
+                self.root.clipboard_append(clipboard_text)
+                # Tk owns the clipboard from here on; flushing idle tasks is
+                # enough, a full update() could also run queued user events
+                self.root.update_idletasks()
             
             messagebox.showinfo(i18n('copied'), i18n('copy_success'))
             
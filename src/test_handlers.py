@@ -8,6 +8,11 @@ import numpy as np
 from io import StringIO
 import sys
 import os
+import tempfile
+import time
+from unittest import mock
+import importlib.util
+import re
 
 # Add src to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -15,10 +20,18 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from handlers import (
     normalize_article_code,
     normalize_code_column,
+    get_excel_columns,
+    get_excel_preview,
+    load_cost_file,
+    load_sap_file,
+    load_input_files,
     parse_clipboard_data,
+    parse_clipboard_single_column,
     prepare_sap_from_clipboard,
     merge_data,
     prepare_result,
+    format_clipboard_values,
+    find_column,
 )
 
 
@@ -107,6 +120,11 @@ class TestNormalizeArticleCode(unittest.TestCase):
         """Test leading zeros in strings are preserved."""
         self.assertEqual(normalize_article_code("00123"), "123")  # Numeric string loses leading zeros
         self.assertEqual(normalize_article_code("ABC00123"), "ABC00123")  # Non-numeric preserves
+    
+    def test_large_python_int_exact(self):
+        """Test Python ints are converted exactly, even beyond float precision."""
+        self.assertEqual(normalize_article_code(12345678901234567), "12345678901234567")
+        self.assertEqual(normalize_article_code(True), "True")  # bool is not treated as int
 
 
 class TestNormalizeCodeColumn(unittest.TestCase):
@@ -131,6 +149,228 @@ class TestNormalizeCodeColumn(unittest.TestCase):
         result = normalize_code_column(series)
         expected = pd.Series(["", "", ""])
         pd.testing.assert_series_equal(result, expected)
+    
+    def test_matches_scalar_normalization(self):
+        """Test vectorized column result equals normalize_article_code per element."""
+        values = [123, -123.0, 123.5, 0.123, "  456.00  ", "1.23E+05", "5E+02",
+                  "00123", "ABC00123", "  ABC  ", "NaN", "none", "", "   ",
+                  "1234567890123456", "0.1234567890123456789", 1e20, None, np.nan,
+                  2**53 + 1, -(2**63) - 1, 10**20 + 1, "9007199254740993", True]
+        result = normalize_code_column(pd.Series(values, dtype=object))
+        self.assertEqual(result.tolist(), [normalize_article_code(v) for v in values])
+    
+    def test_float_forms_independent_of_other_rows(self):
+        """Test strings only float() accepts are normalized the same with or without text rows."""
+        values = ["1_000", "١٢٣"]
+        expected = [normalize_article_code(v) for v in values]
+        self.assertEqual(normalize_code_column(pd.Series(values, dtype=object)).tolist(), expected)
+        self.assertEqual(normalize_code_column(pd.Series(values + ["ABC"], dtype=object)).tolist(),
+                         expected + ["ABC"])
+    
+    def test_repeated_values_column(self):
+        """Test a long column with few distinct codes (normalized per distinct value)."""
+        values = [123.0, " 456 ", "00123", None, "ABC", np.nan] * 5000
+        series = pd.Series(values, dtype=object, index=range(len(values), 0, -1), name="Código")
+        result = normalize_code_column(series)
+        self.assertEqual(result.tolist()[:6], ["123", "456", "123", "", "ABC", ""])
+        self.assertEqual(result.tolist(), result.tolist()[:6] * 5000)
+        self.assertEqual(result.index.tolist(), series.index.tolist())
+        self.assertEqual(result.name, "Código")
+    
+    def test_repeated_values_with_bools(self):
+        """Test bools in a long repeated column are not merged with 1 and 0."""
+        values = [1, True, 0.0, False, "ABC"] * 8000
+        result = normalize_code_column(pd.Series(values, dtype=object))
+        self.assertEqual(result.tolist()[:5], [normalize_article_code(v) for v in values[:5]])
+        self.assertEqual(result.tolist(), result.tolist()[:5] * 8000)
+    
+    def test_numeric_dtype_columns(self):
+        """Test int and float columns are normalized without a string round-trip."""
+        ints = normalize_code_column(pd.Series([1, 20, 300]))
+        self.assertEqual(ints.tolist(), ["1", "20", "300"])
+        floats = normalize_code_column(pd.Series([1.0, 2.5, np.nan, 1.23e5]))
+        self.assertEqual(floats.tolist(), ["1", "2.5", "", "123000"])
+    
+    def test_preserves_index_and_name(self):
+        """Test the result keeps the index and name of the input series."""
+        series = pd.Series([1.0, "2"], index=[10, 20], name="Code")
+        result = normalize_code_column(series)
+        self.assertEqual(result.index.tolist(), [10, 20])
+        self.assertEqual(result.name, "Code")
+
+
+@unittest.skipUnless(os.environ.get("RUN_PERF"), "set RUN_PERF=1 to run timing tests")
+class TestNormalizeCodeColumnPerf(unittest.TestCase):
+    """Timing budgets for normalize_code_column on full-size columns."""
+    
+    def test_large_integer_series(self):
+        """Test 1M integer codes are normalized within the time budget."""
+        series = pd.Series(np.random.default_rng(0).integers(0, 10**9, 1_000_000))
+        start = time.perf_counter()
+        result = normalize_code_column(series)
+        elapsed = time.perf_counter() - start
+        self.assertEqual(result.iloc[0], str(series.iloc[0]))
+        self.assertLess(elapsed, 1.5)
+    
+    def test_large_mixed_series(self):
+        """Test 1M object codes (numbers and strings) are normalized within the time budget."""
+        codes = np.random.default_rng(0).integers(0, 10**9, 1_000_000)
+        series = pd.Series(codes, dtype=object)
+        series[::3] = [f"{code}.0" for code in codes[::3]]
+        start = time.perf_counter()
+        result = normalize_code_column(series)
+        elapsed = time.perf_counter() - start
+        self.assertEqual(result.iloc[0], str(codes[0]))
+        self.assertLess(elapsed, 3.0)
+
+
+class TestLoadExcelFiles(unittest.TestCase):
+    """Test Excel loading functions with files written to a temp directory."""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cost_path = os.path.join(self.tmp.name, "cost.xlsx")
+        self.sap_path = os.path.join(self.tmp.name, "sap.xlsx")
+        pd.DataFrame({
+            "Artículo": [123, 456, "ABC"],
+            "Descripción": ["A", "B", "C"],
+            "Manufactura FC": [10.5, 20.0, 30.0]
+        }).to_excel(self.cost_path, sheet_name="COSTO PROD", index=False)
+        pd.DataFrame({
+            "Tipo": ["I", "I"],
+            "Número de artículo": [456, "ABC"]
+        }).to_excel(self.sap_path, index=False)
+        
+        # Keep the Parquet caches inside the temp directory
+        patcher = mock.patch("handlers.CACHE_DIR", os.path.join(self.tmp.name, "cache"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_get_excel_columns(self):
+        """Test column names are read from the requested sheet."""
+        self.assertEqual(get_excel_columns(self.cost_path, "COSTO PROD"),
+                         ["Artículo", "Descripción", "Manufactura FC"])
+        self.assertEqual(get_excel_columns(self.sap_path), ["Tipo", "Número de artículo"])
+    
+    def test_get_excel_columns_sheet_fallback(self):
+        """Test a missing sheet raises, or falls back to the first sheet if requested."""
+        with self.assertRaises(ValueError):
+            get_excel_columns(self.sap_path, "COSTO PROD")
+        self.assertEqual(get_excel_columns(self.sap_path, "COSTO PROD", fallback_to_first_sheet=True),
+                         ["Tipo", "Número de artículo"])
+        self.assertEqual(get_excel_columns(self.cost_path, "COSTO PROD", fallback_to_first_sheet=True),
+                         ["Artículo", "Descripción", "Manufactura FC"])
+    
+    def test_get_excel_columns_cached_until_file_changes(self):
+        """Test repeated column probes are cached and refreshed on file changes."""
+        get_excel_columns(self.sap_path)
+        pd.DataFrame({"Otro": [1]}).to_excel(self.sap_path, index=False)
+        mtime = os.path.getmtime(self.sap_path) + 10
+        os.utime(self.sap_path, (mtime, mtime))
+        self.assertEqual(get_excel_columns(self.sap_path), ["Otro"])
+    
+    def test_get_excel_preview(self):
+        """Test preview returns the first rows and a modifiable copy."""
+        preview = get_excel_preview(self.cost_path, "COSTO PROD", nrows=2)
+        self.assertEqual(len(preview), 2)
+        preview["Artículo"] = 0
+        self.assertEqual(get_excel_preview(self.cost_path, "COSTO PROD", nrows=2)["Artículo"].tolist(), [123, 456])
+    
+    def test_load_cost_file_reads_needed_columns(self):
+        """Test only the article and value columns are loaded and codes normalized."""
+        df, article_col, value_col = load_cost_file(self.cost_path)
+        self.assertEqual(list(df.columns), ["Artículo", "Manufactura FC"])
+        self.assertEqual(df[article_col].tolist(), ["123", "456", "ABC"])
+        self.assertEqual(df[value_col].tolist(), [10.5, 20.0, 30.0])
+    
+    def test_load_cost_file_missing_column(self):
+        """Test a missing value column raises ValueError."""
+        with self.assertRaises(ValueError) as ctx:
+            load_cost_file(self.cost_path, value_column="Precio")
+        self.assertIn("Precio", str(ctx.exception))
+    
+    def test_load_sap_file_reads_article_column(self):
+        """Test only the article column is loaded from the SAP file."""
+        df, article_col = load_sap_file(self.sap_path)
+        self.assertEqual(list(df.columns), ["Número de artículo"])
+        self.assertEqual(df[article_col].tolist(), ["456", "ABC"])
+    
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow not installed")
+    def test_load_cost_file_cached(self):
+        """Test a second load of an unchanged file comes from the Parquet cache."""
+        df, _, _ = load_cost_file(self.cost_path)
+        with mock.patch("handlers._read_excel", side_effect=AssertionError("Excel re-read")):
+            cached, _, _ = load_cost_file(self.cost_path)
+        pd.testing.assert_frame_equal(cached, df)
+    
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow not installed")
+    @unittest.skipUnless(hasattr(os, "getuid"), "POSIX permissions only")
+    def test_cache_dir_private(self):
+        """Test the cache directory is created private and not trusted once others can access it."""
+        df, _ = load_sap_file(self.sap_path)
+        cache_dir = os.path.join(self.tmp.name, "cache")
+        self.assertEqual(os.stat(cache_dir).st_mode & 0o777, 0o700)
+        
+        os.chmod(cache_dir, 0o755)
+        with mock.patch("handlers._read_excel", return_value=pd.DataFrame({"Número de artículo": [789]})):
+            df, article_col = load_sap_file(self.sap_path)
+        self.assertEqual(df[article_col].tolist(), ["789"])
+    
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow not installed")
+    def test_cache_pruned(self):
+        """Test only the newest CACHE_MAX_FILES cache files are kept."""
+        cache_dir = os.path.join(self.tmp.name, "cache")
+        with mock.patch("handlers.CACHE_MAX_FILES", 1):
+            load_cost_file(self.cost_path)
+            load_sap_file(self.sap_path)
+        self.assertEqual(len([name for name in os.listdir(cache_dir) if name.endswith(".parquet")]), 1)
+        with mock.patch("handlers._read_excel", side_effect=AssertionError("Excel re-read")):
+            load_sap_file(self.sap_path)
+    
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow not installed")
+    def test_cache_version_invalidates(self):
+        """Test caches written by another CACHE_VERSION are not served."""
+        load_sap_file(self.sap_path)
+        with mock.patch("handlers.CACHE_VERSION", -1), \
+                mock.patch("handlers._read_excel", return_value=pd.DataFrame({"Número de artículo": [789]})):
+            df, article_col = load_sap_file(self.sap_path)
+        self.assertEqual(df[article_col].tolist(), ["789"])
+    
+    def test_load_sap_file_cache_invalidated(self):
+        """Test a changed file is read again instead of using the cache."""
+        load_sap_file(self.sap_path)
+        pd.DataFrame({"Número de artículo": [789]}).to_excel(self.sap_path, index=False)
+        mtime = os.path.getmtime(self.sap_path) + 10
+        os.utime(self.sap_path, (mtime, mtime))
+        df, article_col = load_sap_file(self.sap_path)
+        self.assertEqual(df[article_col].tolist(), ["789"])
+    
+    def test_load_without_cache(self):
+        """Test use_cache=False neither reads nor writes the cache."""
+        load_sap_file(self.sap_path, use_cache=False)
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, "cache")))
+    
+    def test_load_files_categorical(self):
+        """Test cache_categorical returns the article column as a categorical."""
+        df, article_col = load_sap_file(self.sap_path, cache_categorical=True)
+        self.assertIsInstance(df[article_col].dtype, pd.CategoricalDtype)
+        self.assertEqual(df[article_col].tolist(), ["456", "ABC"])
+        df_cost, article_col, _ = load_cost_file(self.cost_path, cache_categorical=True)
+        self.assertIsInstance(df_cost[article_col].dtype, pd.CategoricalDtype)
+    
+    def test_load_input_files(self):
+        """Test both files are loaded (in parallel) and load errors are raised."""
+        df_cost, df_sap = load_input_files(self.cost_path, self.sap_path)
+        self.assertEqual(df_cost["Artículo"].tolist(), ["123", "456", "ABC"])
+        self.assertEqual(df_sap["Número de artículo"].tolist(), ["456", "ABC"])
+        with self.assertRaises(ValueError):
+            load_input_files(self.cost_path, self.sap_path, sap_article_col="Código")
+    
+    def test_default_engine(self):
+        """Test pandas' default engine can be selected explicitly."""
+        df, article_col = load_sap_file(self.sap_path, engine=None)
+        self.assertEqual(df[article_col].tolist(), ["456", "ABC"])
 
 
 class TestParseClipboardData(unittest.TestCase):
@@ -163,6 +403,15 @@ class TestParseClipboardData(unittest.TestCase):
             parse_clipboard_data("Col1\tCol2\tCol3")
         self.assertIn("al menos una fila de encabezados y una fila de datos", str(ctx.exception))
     
+    def test_small_and_large_paste_parse_the_same(self):
+        """Test the Python splitter and read_csv give the same frame."""
+        clipboard = "Col1\tCol2\n  \nA\n1\t2\t3\n\t \nB\t0\n\t\n"
+        small = parse_clipboard_data(clipboard)
+        with mock.patch("handlers._SMALL_PASTE_LINES", 0):
+            large = parse_clipboard_data(clipboard)
+        pd.testing.assert_frame_equal(small, large)
+        self.assertEqual(small.values.tolist(), [["A", ""], ["1", "2"], ["B", "0"]])
+    
     def test_uneven_columns(self):
         """Test table with uneven columns is handled."""
         clipboard = "Col1\tCol2\tCol3\nA\tB"  # Missing third column
@@ -189,6 +438,53 @@ class TestParseClipboardData(unittest.TestCase):
         result = parse_clipboard_data(clipboard)
         self.assertEqual(len(result), 2)  # Only 2 data rows
 
+    def test_whitespace_lines_ignored(self):
+        """Test lines with only tabs/spaces between data rows are ignored."""
+        clipboard = "Col1\tCol2\nA\tB\n\t\n  \t \nC\tD"
+        result = parse_clipboard_data(clipboard)
+        self.assertEqual(result["Col1"].tolist(), ["A", "C"])
+    
+    def test_extra_fields_keep_row(self):
+        """Test a row with content only beyond the header count is kept."""
+        clipboard = "Col1\tCol2\nA\tB\n\t\tExtra\nC\tD"
+        result = parse_clipboard_data(clipboard)
+        self.assertEqual(len(result), 3)
+        self.assertEqual(result.iloc[1].tolist(), ["", ""])
+    
+    def test_quotes_taken_literally(self):
+        """Test quote characters are kept as data, not parsed as CSV quoting."""
+        clipboard = "Col1\tCol2\n\"A\tB\nC\"\tD"
+        result = parse_clipboard_data(clipboard)
+        self.assertEqual(result["Col1"].tolist(), ['"A', 'C"'])
+
+
+class TestParseClipboardSingleColumn(unittest.TestCase):
+    """Test parse_clipboard_single_column function."""
+    
+    def test_extracts_column(self):
+        """Test only the requested column is returned."""
+        clipboard = "Tipo\tNúmero de artículo\tDescripción\nI\t123\tA\nI\t456\tB"
+        result = parse_clipboard_single_column(clipboard, "Número de artículo")
+        self.assertEqual(list(result.columns), ["Número de artículo"])
+        self.assertEqual(result["Número de artículo"].tolist(), ["123", "456"])
+    
+    def test_blank_lines_and_short_rows(self):
+        """Test blank lines are skipped and other rows kept, like parse_clipboard_data."""
+        clipboard = "A\tB\n1\t10\n   \n2\n\tExtra\n3\t30"
+        result = parse_clipboard_single_column(clipboard, "B")
+        self.assertEqual(result["B"].tolist(), ["10", "", "Extra", "30"])
+    
+    def test_missing_column(self):
+        """Test a missing column raises ValueError."""
+        with self.assertRaises(ValueError) as ctx:
+            parse_clipboard_single_column("A\tB\n1\t2", "C")
+        self.assertIn("not found", str(ctx.exception))
+    
+    def test_only_headers(self):
+        """Test clipboard with only headers raises ValueError."""
+        with self.assertRaises(ValueError):
+            parse_clipboard_single_column("A\tB\n  \n", "A")
+
 
 class TestPrepareSapFromClipboard(unittest.TestCase):
     """Test prepare_sap_from_clipboard function."""
@@ -223,6 +519,16 @@ class TestPrepareSapFromClipboard(unittest.TestCase):
         result, col_name = prepare_sap_from_clipboard(df, article_column="Article Code")
         self.assertEqual(col_name, "Article Code")
         self.assertEqual(result["Article Code"].iloc[0], "123")
+    
+    def test_input_not_modified(self):
+        """Test the pasted DataFrame is left unchanged."""
+        df = pd.DataFrame({
+            "Número de artículo": ["123.0", "456"],
+            "Descripción": ["A", "B"]
+        })
+        result, _ = prepare_sap_from_clipboard(df)
+        self.assertEqual(result["Número de artículo"].tolist(), ["123", "456"])
+        self.assertEqual(df["Número de artículo"].tolist(), ["123.0", "456"])
 
 
 class TestMergeData(unittest.TestCase):
@@ -332,6 +638,110 @@ class TestMergeData(unittest.TestCase):
         self.assertEqual(value_col, "Price")
         self.assertEqual(len(result), 2)
         self.assertEqual(result["Price"].iloc[0], 10.5)
+    
+    def test_sap_columns_and_index_kept(self):
+        """Test merged result is the SAP data plus the value column."""
+        df_sap = pd.DataFrame({
+            "Número de artículo": ["456", "123"],
+            "Descripción": ["B", "A"]
+        }, index=[5, 7])
+        df_cost = pd.DataFrame({
+            "Artículo": ["123", "456"],
+            "Manufactura FC": [10, 20]
+        })
+        result, _, _ = merge_data(df_sap, df_cost)
+        self.assertEqual(list(result.columns), ["Número de artículo", "Descripción", "Manufactura FC"])
+        self.assertEqual(result.index.tolist(), [5, 7])
+        self.assertEqual(result["Manufactura FC"].tolist(), [20, 10])
+        self.assertNotIn("Manufactura FC", df_sap.columns)  # Input not modified
+    
+    def test_skip_normalize(self):
+        """Test already-normalized columns are used as-is when skip_normalize is set."""
+        df_sap = pd.DataFrame({"Número de artículo": ["123", "456"]})
+        df_cost = pd.DataFrame({
+            "Artículo": ["123", "456.0"],  # "456.0" is not re-normalized
+            "Manufactura FC": [10, 20]
+        })
+        result, _, _ = merge_data(df_sap, df_cost, skip_normalize=True)
+        self.assertEqual(result["Manufactura FC"].iloc[0], 10)
+        self.assertTrue(pd.isna(result["Manufactura FC"].iloc[1]))
+        self.assertNotIn("Manufactura FC", df_sap.columns)
+    
+    def test_map_based_merge_equivalence(self):
+        """Test the merge equals a dict lookup of the first cost value per code, on random data."""
+        rng = np.random.default_rng(0)
+        df_sap = pd.DataFrame({"Número de artículo": rng.integers(0, 3000, 10000).astype(str)})
+        df_cost = pd.DataFrame({
+            "Artículo": rng.integers(0, 3000, 2500).astype(str),
+            "Manufactura FC": rng.random(2500)
+        })
+        # Reversed so the first occurrence of a duplicate code wins
+        first_values = dict(zip(df_cost["Artículo"][::-1], df_cost["Manufactura FC"][::-1]))
+        expected = df_sap["Número de artículo"].map(first_values)
+        
+        result, _, _ = merge_data(df_sap, df_cost)
+        pd.testing.assert_series_equal(result["Manufactura FC"], expected, check_names=False)
+        
+        categorical, _, _ = merge_data(
+            df_sap.astype("category"), df_cost.astype({"Artículo": "category"}), skip_normalize=True
+        )
+        pd.testing.assert_series_equal(categorical["Manufactura FC"], expected, check_names=False)
+    
+    def test_categorical_article_columns(self):
+        """Test categorical article columns give the same values as plain strings."""
+        df_sap = pd.DataFrame({
+            "Número de artículo": pd.Series(["456", "999", "123", "456", None], dtype="category")
+        })
+        df_cost = pd.DataFrame({
+            "Artículo": pd.Series(["123", "456"], dtype="category"),
+            "Manufactura FC": [10.5, 20.0]
+        })
+        result, _, _ = merge_data(df_sap, df_cost, skip_normalize=True)
+        values = result["Manufactura FC"].tolist()
+        self.assertEqual(values[0], 20.0)
+        self.assertTrue(pd.isna(values[1]))
+        self.assertEqual(values[2:4], [10.5, 20.0])
+        self.assertTrue(pd.isna(values[4]))
+    
+    def test_categorical_shared_categories(self):
+        """Test categorical columns with the same categories keep the first duplicate."""
+        dtype = pd.CategoricalDtype(["123", "456", "789"])
+        df_sap = pd.DataFrame({
+            "Número de artículo": pd.Series(["789", "123", "456"], dtype=dtype)
+        })
+        df_cost = pd.DataFrame({
+            "Artículo": pd.Series(["123", "456", "123", None], dtype=dtype),
+            "Manufactura FC": [10.5, 20.0, 99.0, 1.0]
+        })
+        result, _, _ = merge_data(df_sap, df_cost, skip_normalize=True)
+        values = result["Manufactura FC"].tolist()
+        self.assertTrue(pd.isna(values[0]))
+        self.assertEqual(values[1:], [10.5, 20.0])
+    
+    def test_categorical_empty_cost(self):
+        """Test a categorical cost frame without rows gives NaN for every SAP row."""
+        df_sap = pd.DataFrame({
+            "Número de artículo": pd.Series(["123", "456", None], dtype="category")
+        })
+        df_cost = pd.DataFrame({
+            "Artículo": pd.Series([], dtype=str).astype("category"),
+            "Manufactura FC": pd.Series([], dtype=float)
+        })
+        result, _, _ = merge_data(df_sap, df_cost, skip_normalize=True)
+        self.assertTrue(result["Manufactura FC"].isna().all())
+        self.assertEqual(len(result), 3)
+    
+    def test_inputs_not_modified(self):
+        """Test normalizing the article columns does not change the input frames."""
+        df_sap = pd.DataFrame({"Número de artículo": [123.0, 456.0]})
+        df_cost = pd.DataFrame({
+            "Artículo": ["00123", "456.0"],
+            "Manufactura FC": [10, 20]
+        })
+        result, _, _ = merge_data(df_sap, df_cost)
+        self.assertEqual(result["Manufactura FC"].tolist(), [10, 20])
+        self.assertEqual(df_sap["Número de artículo"].tolist(), [123.0, 456.0])
+        self.assertEqual(df_cost["Artículo"].tolist(), ["00123", "456.0"])
 
 
 class TestPrepareResult(unittest.TestCase):
@@ -392,6 +802,74 @@ class TestPrepareResult(unittest.TestCase):
         })
         result = prepare_result(df)
         self.assertEqual(result["Manufactura FC"].iloc[0], 0)
+    
+    def test_integer_values_keep_dtype(self):
+        """Test integer values without missing entries stay integers."""
+        df = pd.DataFrame({
+            "Número de artículo": ["123", "456"],
+            "Manufactura FC": [10, 20]
+        }, index=[3, 8])
+        result = prepare_result(df)
+        self.assertTrue(pd.api.types.is_integer_dtype(result["Manufactura FC"].dtype))
+        self.assertEqual(result.index.tolist(), [3, 8])
+    
+    def test_downcast(self):
+        """Test downcast narrows values only when they are kept exactly."""
+        df = pd.DataFrame({
+            "Número de artículo": ["123", "456"],
+            "Manufactura FC": [10.0, np.nan]
+        })
+        result = prepare_result(df, downcast=True)
+        self.assertEqual(result["Manufactura FC"].dtype, np.int8)
+        self.assertEqual(result["Manufactura FC"].tolist(), [10, 0])
+        
+        df["Manufactura FC"] = [10.5, 20.25]
+        self.assertEqual(prepare_result(df, downcast=True)["Manufactura FC"].dtype, np.float32)
+        
+        df["Manufactura FC"] = [10.15, 20.0]  # Not exact in float32
+        result = prepare_result(df, downcast=True)
+        self.assertEqual(result["Manufactura FC"].dtype, np.float64)
+        self.assertEqual(result["Manufactura FC"].iloc[0], 10.15)
+
+
+class TestFormatClipboardValues(unittest.TestCase):
+    """Test format_clipboard_values function."""
+    
+    def test_matches_string_join(self):
+        """Test output equals joining the values converted with astype(str)."""
+        values = pd.Series([10.5, 20.0, 0.1, 1e20, -3.25])
+        self.assertEqual(format_clipboard_values(values), "\n".join(values.astype(str).tolist()))
+    
+    def test_missing_values_empty(self):
+        """Test missing values become empty lines."""
+        self.assertEqual(format_clipboard_values(pd.Series([1.5, np.nan, 2.0])), "1.5\n\n2.0")
+        self.assertEqual(format_clipboard_values(pd.Series([1, None], dtype="Int64")), "1\n")
+    
+    def test_integers_and_empty(self):
+        """Test integer columns and empty columns."""
+        self.assertEqual(format_clipboard_values(pd.Series([10, 0, -5])), "10\n0\n-5")
+        self.assertEqual(format_clipboard_values(pd.Series([], dtype=float)), "")
+
+
+class TestFindColumn(unittest.TestCase):
+    """Test find_column function."""
+    
+    def test_priority_order(self):
+        """Test a higher-priority pattern wins over an earlier column."""
+        patterns = [re.compile(p, re.I) for p in (r'manufactura', r'costo', r'\bfc\b')]
+        columns = ["Artículo", "Costo Total", "Manufactura FC", "FC"]
+        self.assertEqual(find_column(columns, patterns), "Manufactura FC")
+        self.assertEqual(find_column(["FC", "Costo"], patterns), "Costo")
+    
+    def test_first_column_for_same_pattern(self):
+        """Test the first matching column is chosen for the same pattern."""
+        patterns = [re.compile(r'art[ií]culo', re.I)]
+        self.assertEqual(find_column(["Número de artículo", "Artículo"], patterns), "Número de artículo")
+    
+    def test_no_match(self):
+        """Test None is returned when nothing matches, non-string names are allowed."""
+        patterns = [re.compile(r'fc', re.I)]
+        self.assertIsNone(find_column([1, "Descripción"], patterns))
 
 
 class TestIntegration(unittest.TestCase):